@@ -19,6 +19,7 @@ from fastapi.security import APIKeyHeader
 from pydantic import BaseModel
 
 from core.agent import ScoutAgent, AgentTask, AgentResponse
+from core.tools.web_tools import close_session
 from scheduler.scheduler import TaskScheduler
 from utils.logger import get_logger
 
@@ -96,6 +97,9 @@ def create_app(agent: ScoutAgent, scheduler: TaskScheduler) -> FastAPI:
         version="1.0.0"
     )
     
+    # Drain the shared HTTP session's keep-alive connections on exit
+    app.add_event_handler("shutdown", close_session)
+    
     # Configure CORS
     cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:8001,http://127.0.0.1:8001").split(",")
     app.add_middleware(
@@ -554,4 +558,5 @@ def create_app(agent: ScoutAgent, scheduler: TaskScheduler) -> FastAPI:
         """Health check endpoint."""
         return {"status": "healthy", "timestamp": datetime.now().isoformat()}
     
-    return app
\ No newline at end of file
+    return app
+
@@ -78,7 +78,7 @@ async def system_info():
         agent_info = {
             "tasks_count": len(get_agent().tasks),
             "tools_count": len(get_agent().tools),
-            "scheduled_tasks_count": len(get_scheduler().scheduled_tasks)
+            "scheduled_tasks_count": len(get_scheduler().view)
         }
         
         return {
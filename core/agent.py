@@ -68,7 +68,7 @@ class TaskExecutor:
         self.agent = agent
         self.task = task
         self.session_id = session_id
-        self.logger = TaskLogger(task.id)
+        self.logger = TaskLogger.get(task.id)
         
         # Task-specific memory
         self.memory = ConversationBufferMemory(return_messages=True)
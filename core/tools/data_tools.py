@@ -7,7 +7,9 @@ This module provides data-related tools for the agent.
 import os
 import json
 import csv
+import time
 import logging
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Union
 from pathlib import Path
 
@@ -15,13 +17,117 @@ import numpy as np
 import pandas as pd
 from utils.logger import get_logger
 
+logger = get_logger(__name__)
+
+# Buffer size for JSON file reads/writes (the default is 8 KiB)
+_IO_BUFFER_SIZE = 1 << 20
+
+# Quartiles need a sort per column, so they are skipped on very large tables
+_QUARTILE_MAX_ROWS = 10**6
+
+
+def _describe_values(values: np.ndarray, with_quartiles: bool) -> Dict[str, float]:
+    """
+    Compute describe()-style statistics for a column's non-null values.
+    
+    Args:
+        values: The column's values as a float64 array, without NaNs
+        with_quartiles: Whether to include the 25%/50%/75% quartiles
+        
+    Returns:
+        A dictionary of statistics in describe() order
+    """
+    count = values.size
+    nan = float("nan")
+    
+    stats = {
+        "count": float(count),
+        "mean": float(values.mean()) if count else nan,
+        "std": float(values.std(ddof=1)) if count > 1 else nan,
+        "min": float(values.min()) if count else nan,
+    }
+    
+    if with_quartiles:
+        if count:
+            q1, q2, q3 = np.percentile(values, [25, 50, 75])
+        else:
+            q1 = q2 = q3 = nan
+        stats["25%"] = float(q1)
+        stats["50%"] = float(q2)
+        stats["75%"] = float(q3)
+    
+    stats["max"] = float(values.max()) if count else nan
+    return stats
+
+
+def _pearson_matrix(values: np.ndarray) -> np.ndarray:
+    """
+    Compute the Pearson correlation matrix of a NaN-free 2-D array.
+    
+    All pairwise cross-products come out of a single matrix multiply over the
+    centered data, instead of one pass per column pair.
+    
+    Args:
+        values: A (rows, columns) array without missing values
+        
+    Returns:
+        A float64 (columns, columns) correlation matrix (NaN for constant columns)
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        centered = values - values.mean(axis=0)
+        cov = centered.T @ centered
+        std = np.sqrt(np.diag(cov))
+        corr = cov / np.outer(std, std)
+    
+    return np.clip(corr, -1.0, 1.0)
+
 
 class DataTools:
     """Provides data-related tools for the agent."""
     
     def __init__(self):
         """Initialize the data tools."""
-        self.logger = get_logger(__name__)
+        self.logger = logger
+        
+        # Default output directory for plots
+        self._plots_dir = Path("data/plots")
+        self._plots_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Plot figure, created on first use and reused across plot_data calls
+        self._fig = None
+        self._ax = None
+        
+        # Plot type -> (plotter, required columns, error if a column is missing)
+        self._plotters = {
+            "bar": (self._plot_bar, ("x",), "Bar plot requires at least x_column"),
+            "line": (self._plot_line, ("x", "y"), "Line plot requires both x_column and y_column"),
+            "scatter": (self._plot_scatter, ("x", "y"), "Scatter plot requires both x_column and y_column"),
+            "hist": (self._plot_hist, ("x",), "Histogram requires x_column"),
+            "pie": (self._plot_pie, ("x",), "Pie chart requires x_column"),
+        }
+    
+    def _get_axes(self):
+        """
+        Get the shared plot figure with fresh axes for a new plot.
+        
+        Returns:
+            A (Figure, Axes) tuple
+        """
+        if self._fig is None:
+            # Non-interactive backend: no GUI state is created for saved plots
+            import matplotlib
+            matplotlib.use("Agg")
+            from matplotlib.figure import Figure
+            
+            # A bare Figure is not tracked by pyplot's global figure registry
+            self._fig = Figure(figsize=(10, 6))
+        else:
+            # Axes.clear() keeps state such as the equal aspect a pie chart
+            # sets, so the axes are rebuilt rather than cleared
+            self._fig.clear()
+        
+        self._ax = self._fig.subplots()
+        return self._fig, self._ax
     
     async def load_csv(self, path: str) -> Dict[str, Any]:
         """
@@ -98,7 +204,7 @@ class DataTools:
                 }
             
             # Read the JSON file
-            with open(file_path, "r", encoding="utf-8") as f:
+            with open(file_path, "r", encoding="utf-8", buffering=_IO_BUFFER_SIZE) as f:
                 data = json.load(f)
             
             # Get basic information about the data
@@ -190,7 +296,7 @@ class DataTools:
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Save to JSON
-            with open(file_path, "w", encoding="utf-8") as f:
+            with open(file_path, "w", encoding="utf-8", buffering=_IO_BUFFER_SIZE) as f:
                 json.dump(data, f, indent=2)
             
             return {
@@ -230,7 +336,7 @@ class DataTools:
             if file_path.suffix.lower() == ".csv":
                 df = pd.read_csv(file_path)
             elif file_path.suffix.lower() == ".json":
-                with open(file_path, "r", encoding="utf-8") as f:
+                with open(file_path, "r", encoding="utf-8", buffering=_IO_BUFFER_SIZE) as f:
                     data = json.load(f)
                 
                 if isinstance(data, list) and data and isinstance(data[0], dict):
@@ -246,31 +352,51 @@ class DataTools:
                     "error": f"Unsupported file type: {file_path.suffix}"
                 }
             
+            # Per-column pass: dtype, null count and, for numeric columns, the
+            # descriptive statistics, so each column's data is streamed once
+            numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
+            numeric_set = set(numeric_cols)
+            with_quartiles = len(df) < _QUARTILE_MAX_ROWS
+            
+            dtypes = {}
+            missing_values = {}
+            numeric_stats = {}
+            
+            for col, dtype in df.dtypes.items():
+                dtypes[col] = str(dtype)
+                
+                if col in numeric_set and dtype.kind in "iuf":
+                    values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                    missing = np.isnan(values)
+                    nulls = int(missing.sum())
+                    numeric_stats[col] = _describe_values(values[~missing] if nulls else values, with_quartiles)
+                else:
+                    nulls = int(df[col].isnull().sum())
+                    if col in numeric_set:
+                        # Complex/timedelta columns keep pandas' own describe()
+                        numeric_stats[col] = df[col].describe().to_dict()
+                
+                missing_values[col] = nulls
+            
             # Basic statistics
             basic_stats = {
                 "rows": len(df),
                 "columns": len(df.columns),
                 "column_names": df.columns.tolist(),
-                "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
-                "missing_values": df.isnull().sum().to_dict()
+                "dtypes": dtypes,
+                "missing_values": missing_values
             }
             
-            # Descriptive statistics for numeric columns
-            numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-            if numeric_cols:
-                numeric_stats = df[numeric_cols].describe().to_dict()
-            else:
-                numeric_stats = {}
-            
             # Categorical statistics
             categorical_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
             categorical_stats = {}
             
             for col in categorical_cols:
                 try:
-                    value_counts = df[col].value_counts().to_dict()
-                    unique_values = len(value_counts)
-                    top_values = dict(sorted(value_counts.items(), key=lambda x: x[1], reverse=True)[:5])
+                    # Count on the integer category codes rather than hashing each string
+                    cat = df[col].astype("category")
+                    unique_values = cat.cat.categories.size
+                    top_values = cat.value_counts(sort=True).head(5).to_dict()
                     categorical_stats[col] = {
                         "unique_values": unique_values,
                         "top_values": top_values
@@ -281,7 +407,19 @@ class DataTools:
             # Correlations between numeric columns
             correlations = {}
             if len(numeric_cols) > 1:
-                corr_matrix = df[numeric_cols].corr().round(2)
+                # float64 throughout: float32 quantises large-magnitude values
+                # such as epoch timestamps and skews their correlations
+                numeric = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+                
+                if np.isnan(numeric).any():
+                    # Pairwise-complete observations are needed with missing values
+                    corr_matrix = pd.DataFrame(numeric, columns=numeric_cols).corr()
+                else:
+                    corr_matrix = pd.DataFrame(
+                        _pearson_matrix(numeric), index=numeric_cols, columns=numeric_cols
+                    )
+                
+                corr_matrix = corr_matrix.round(2)
                 
                 # Get top correlations
                 corr_pairs = []
@@ -352,7 +490,7 @@ class DataTools:
                 if file_path.suffix.lower() == ".csv":
                     df = pd.read_csv(file_path)
                 elif file_path.suffix.lower() == ".json":
-                    with open(file_path, "r", encoding="utf-8") as f:
+                    with open(file_path, "r", encoding="utf-8", buffering=_IO_BUFFER_SIZE) as f:
                         data = json.load(f)
                     
                     if isinstance(data, list) and data and isinstance(data[0], dict):
@@ -368,7 +506,21 @@ class DataTools:
                         "error": f"Unsupported file type: {file_path.suffix}"
                     }
             else:
-                df = pd.DataFrame(data)
+                # Only build the columns the plot uses
+                columns = list(dict.fromkeys(c for c in (x_column, y_column) if c))
+                
+                if columns:
+                    # from_records would fill a column absent from every record with NaN
+                    for column in columns:
+                        if not any(column in record for record in data):
+                            return {
+                                "success": False,
+                                "error": f"Column not found: {column}"
+                            }
+                    
+                    df = pd.DataFrame.from_records(data, columns=columns)
+                else:
+                    df = pd.DataFrame(data)
             
             # Verify columns existence
             if x_column and x_column not in df.columns:
@@ -396,84 +548,43 @@ class DataTools:
             
             # Set default output path
             if not output_path:
-                output_dir = Path("data/plots")
-                output_dir.mkdir(parents=True, exist_ok=True)
-                output_path = str(output_dir / f"plot_{plot_type}_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.png")
+                output_path = str(self._plots_dir / f"plot_{plot_type}_{time.strftime('%Y%m%d_%H%M%S')}.png")
             else:
                 output_file = Path(output_path)
                 output_file.parent.mkdir(parents=True, exist_ok=True)
             
-            # Create the plot
-            import matplotlib.pyplot as plt
-            
-            plt.figure(figsize=(10, 6))
-            
-            if plot_type == "bar":
-                if x_column and y_column:
-                    df.plot(kind="bar", x=x_column, y=y_column)
-                elif x_column:
-                    df[x_column].value_counts().plot(kind="bar")
-                else:
-                    return {
-                        "success": False,
-                        "error": "Bar plot requires at least x_column"
-                    }
-            
-            elif plot_type == "line":
-                if x_column and y_column:
-                    df.plot(kind="line", x=x_column, y=y_column)
-                else:
-                    return {
-                        "success": False,
-                        "error": "Line plot requires both x_column and y_column"
-                    }
-            
-            elif plot_type == "scatter":
-                if x_column and y_column:
-                    df.plot(kind="scatter", x=x_column, y=y_column)
-                else:
-                    return {
-                        "success": False,
-                        "error": "Scatter plot requires both x_column and y_column"
-                    }
-            
-            elif plot_type == "hist":
-                if x_column:
-                    df[x_column].plot(kind="hist")
-                else:
-                    return {
-                        "success": False,
-                        "error": "Histogram requires x_column"
-                    }
-            
-            elif plot_type == "pie":
-                if x_column:
-                    df[x_column].value_counts().plot(kind="pie")
-                else:
-                    return {
-                        "success": False,
-                        "error": "Pie chart requires x_column"
-                    }
-            
-            else:
+            # Look up the plotter and check its required columns
+            plotter = self._plotters.get(plot_type)
+            if plotter is None:
                 return {
                     "success": False,
                     "error": f"Unsupported plot type: {plot_type}"
                 }
             
+            plot_fn, required_columns, requirement_error = plotter
+            columns = {"x": x_column, "y": y_column}
+            if not all(columns[c] for c in required_columns):
+                return {
+                    "success": False,
+                    "error": requirement_error
+                }
+            
+            # Create the plot
+            fig, ax = self._get_axes()
+            plot_fn(df, ax, x_column, y_column)
+            
             # Set title and labels
-            plt.title(title)
+            ax.set_title(title)
             
             if x_column:
-                plt.xlabel(x_column)
+                ax.set_xlabel(x_column)
             
             if y_column:
-                plt.ylabel(y_column)
+                ax.set_ylabel(y_column)
             
             # Save the plot
-            plt.tight_layout()
-            plt.savefig(output_path)
-            plt.close()
+            fig.tight_layout()
+            fig.savefig(output_path)
             
             return {
                 "success": True,
@@ -489,11 +600,37 @@ class DataTools:
                 "error": str(e)
             }
 
+    def _plot_bar(self, df: pd.DataFrame, ax, x_column: str, y_column: Optional[str]):
+        """Draw a bar plot (value counts of x_column if no y_column)."""
+        if y_column:
+            df.plot(kind="bar", x=x_column, y=y_column, ax=ax)
+        else:
+            df[x_column].value_counts().plot(kind="bar", ax=ax)
+    
+    def _plot_line(self, df: pd.DataFrame, ax, x_column: str, y_column: str):
+        """Draw a line plot."""
+        df.plot(kind="line", x=x_column, y=y_column, ax=ax)
+    
+    def _plot_scatter(self, df: pd.DataFrame, ax, x_column: str, y_column: str):
+        """Draw a scatter plot."""
+        df.plot(kind="scatter", x=x_column, y=y_column, ax=ax)
+    
+    def _plot_hist(self, df: pd.DataFrame, ax, x_column: str, y_column: Optional[str]):
+        """Draw a histogram of x_column."""
+        df[x_column].plot(kind="hist", ax=ax)
+    
+    def _plot_pie(self, df: pd.DataFrame, ax, x_column: str, y_column: Optional[str]):
+        """Draw a pie chart of the value counts of x_column."""
+        df[x_column].value_counts().plot(kind="pie", ax=ax)
 
+
+@lru_cache(maxsize=1)
 def get_data_tools() -> Dict[str, Any]:
     """
     Get the data tools.
     
+    A single shared instance is built on first use.
+    
     Returns:
         A dictionary of data tool functions
     """
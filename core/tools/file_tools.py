@@ -7,27 +7,155 @@ This module provides file-related tools for the agent.
 import os
 import shutil
 import json
+import asyncio
 import logging
 import mimetypes
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Union
 from pathlib import Path
 
 from utils.logger import get_logger
 
+logger = get_logger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# FICLONE ioctl request (reflink copy on Btrfs/XFS); exposed by fcntl since Python 3.12
+_FICLONE = getattr(fcntl, "FICLONE", 0x40049409) if fcntl else None
+
+
+# Chunk size for os.sendfile copies
+_SENDFILE_CHUNK = 1 << 20
+
+# Buffer size for text reads/writes (the default is 8 KiB)
+_IO_BUFFER_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=512)
+def _mime_for_suffix(suffix: str) -> Optional[str]:
+    """
+    Guess a MIME type from a file suffix.
+    
+    Args:
+        suffix: The file's suffixes (e.g. ".txt" or ".tar.gz")
+        
+    Returns:
+        The MIME type or None if unknown
+    """
+    return mimetypes.guess_type("x" + suffix)[0]
+
+
+# Initialize the mimetypes database at import rather than on the first read
+_mime_for_suffix(".txt")
+
+
+def _kernel_copy(src_fd: int, dst_fd: int) -> bool:
+    """
+    Copy between two open file descriptors without moving data through user space.
+    
+    Tries a reflink clone, then os.copy_file_range, then os.sendfile. On
+    failure of one method, both descriptors are rewound before the next.
+    
+    Args:
+        src_fd: The source file descriptor
+        dst_fd: The destination file descriptor
+        
+    Returns:
+        True if the data was copied, False if no kernel copy method worked
+    """
+    # Reflink clone: no data is moved at all on CoW filesystems
+    if _FICLONE is not None:
+        try:
+            fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+            return True
+        except OSError:
+            pass
+    
+    # In-kernel page copy
+    if hasattr(os, "copy_file_range"):
+        try:
+            while os.copy_file_range(src_fd, dst_fd, 1 << 30):
+                pass
+            return True
+        except OSError:
+            os.ftruncate(dst_fd, 0)
+            os.lseek(src_fd, 0, os.SEEK_SET)
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+    
+    # sendfile to a regular file (Linux only; other platforms need a socket)
+    if hasattr(os, "sendfile"):
+        try:
+            offset = 0
+            while True:
+                sent = os.sendfile(dst_fd, src_fd, offset, _SENDFILE_CHUNK)
+                if not sent:
+                    break
+                offset += sent
+            return True
+        except OSError:
+            os.ftruncate(dst_fd, 0)
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+    
+    return False
+
+
+def _fast_copy(src: str, dst: str) -> str:
+    """
+    Copy a file and its metadata, keeping the data copy inside the kernel.
+    
+    Falls back to shutil.copyfile where no kernel copy method is available.
+    Has the same signature as shutil.copy2 so it can be used as a copytree
+    copy_function.
+    
+    Args:
+        src: The source file path
+        dst: The destination file path
+        
+    Returns:
+        The destination path
+        
+    Raises:
+        shutil.SameFileError: If src and dst are the same file, like shutil.copy2
+    """
+    # Opening dst with O_TRUNC would empty the source
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    
+    src_fd = os.open(src, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            copied = _kernel_copy(src_fd, dst_fd)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    
+    if not copied:
+        shutil.copyfile(src, dst)
+    
+    shutil.copystat(src, dst)
+    return dst
+
 
 class FileTools:
     """Provides file-related tools for the agent."""
     
     def __init__(self):
         """Initialize the file tools."""
-        self.logger = get_logger(__name__)
+        self.logger = logger
     
-    async def read_file(self, path: str) -> Dict[str, Any]:
+    async def read_file(self, path: str, binary_ok: bool = False) -> Dict[str, Any]:
         """
         Read a file and return its contents.
         
         Args:
             path: The path to the file
+            binary_ok: Return the raw bytes without decoding (for callers that
+                only pass the content on, e.g. to write_file)
             
         Returns:
             A dictionary with the file content and metadata
@@ -46,14 +174,25 @@ class FileTools:
             stat_info = file_path.stat()
             
             # Determine file type
-            mime_type, _ = mimetypes.guess_type(str(file_path))
+            mime_type = _mime_for_suffix("".join(file_path.suffixes))
+            
+            # Pass-through reads skip the decode and return the raw bytes
+            if binary_ok:
+                content = await asyncio.to_thread(file_path.read_bytes)
+                
+                return {
+                    "success": True,
+                    "content": content,
+                    "mime_type": mime_type or "application/octet-stream",
+                    "size": stat_info.st_size,
+                    "is_text": False
+                }
             
             # For text files, read the content
             if mime_type is None or mime_type.startswith("text/") or mime_type in [
                 "application/json", "application/xml", "application/javascript"
             ]:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
+                content = await asyncio.to_thread(self._read_text, file_path)
                 
                 return {
                     "success": True,
@@ -79,13 +218,13 @@ class FileTools:
                 "error": str(e)
             }
     
-    async def write_file(self, path: str, content: str) -> Dict[str, Any]:
+    async def write_file(self, path: str, content: Union[str, bytes]) -> Dict[str, Any]:
         """
         Write content to a file.
         
         Args:
             path: The path to the file
-            content: The content to write
+            content: The content to write (bytes are written as-is)
             
         Returns:
             A dictionary with the result
@@ -97,8 +236,10 @@ class FileTools:
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Write the content
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            if isinstance(content, bytes):
+                await asyncio.to_thread(file_path.write_bytes, content)
+            else:
+                await asyncio.to_thread(self._write_text, file_path, content, "w")
             
             return {
                 "success": True,
@@ -131,8 +272,7 @@ class FileTools:
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Append the content
-            with open(file_path, "a", encoding="utf-8") as f:
-                f.write(content)
+            await asyncio.to_thread(self._write_text, file_path, content, "a")
             
             return {
                 "success": True,
@@ -341,20 +481,9 @@ class FileTools:
             # Create parent directories if they don't exist
             dest_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Copy the item
-            if source_path.is_dir():
-                if dest_path.exists() and dest_path.is_dir():
-                    # If the destination exists and is a directory, copy the contents
-                    for item in source_path.iterdir():
-                        if item.is_dir():
-                            shutil.copytree(str(item), str(dest_path / item.name))
-                        else:
-                            shutil.copy2(str(item), str(dest_path / item.name))
-                else:
-                    # Otherwise, copy the whole directory
-                    shutil.copytree(str(source_path), str(dest_path))
-            else:
-                shutil.copy2(str(source_path), str(dest_path))
+            # Copy the item in a single worker-thread hop, so a directory copy
+            # doesn't bounce back to the event loop once per entry
+            await asyncio.to_thread(self._copy_item, source_path, dest_path)
             
             return {
                 "success": True,
@@ -369,11 +498,63 @@ class FileTools:
                 "error": str(e)
             }
 
+    def _read_text(self, file_path: Path) -> str:
+        """
+        Read a text file (blocking; run via asyncio.to_thread).
+        
+        Args:
+            file_path: The path to the file
+            
+        Returns:
+            The file content
+        """
+        with open(file_path, "r", encoding="utf-8", buffering=_IO_BUFFER_SIZE) as f:
+            return f.read()
+    
+    def _write_text(self, file_path: Path, content: str, mode: str) -> None:
+        """
+        Write or append text to a file (blocking; run via asyncio.to_thread).
+        
+        Args:
+            file_path: The path to the file
+            content: The content to write
+            mode: The open mode ("w" or "a")
+        """
+        with open(file_path, mode, encoding="utf-8", buffering=_IO_BUFFER_SIZE) as f:
+            f.write(content)
+    
+    def _copy_item(self, source_path: Path, dest_path: Path) -> None:
+        """
+        Copy a file or directory (blocking; run via asyncio.to_thread).
+        
+        Args:
+            source_path: The source path
+            dest_path: The destination path
+        """
+        if source_path.is_dir():
+            if dest_path.exists() and dest_path.is_dir():
+                # If the destination exists and is a directory, copy the contents
+                for item in source_path.iterdir():
+                    if item.is_dir():
+                        shutil.copytree(str(item), str(dest_path / item.name), copy_function=_fast_copy)
+                    else:
+                        _fast_copy(str(item), str(dest_path / item.name))
+            else:
+                # Otherwise, copy the whole directory
+                shutil.copytree(str(source_path), str(dest_path), copy_function=_fast_copy)
+        else:
+            if dest_path.is_dir():
+                dest_path = dest_path / source_path.name
+            _fast_copy(str(source_path), str(dest_path))
+
 
+@lru_cache(maxsize=1)
 def get_file_tools() -> Dict[str, Any]:
     """
     Get the file tools.
     
+    The tools are stateless, so a single shared instance is built on first use.
+    
     Returns:
         A dictionary of file tool functions
     """
@@ -5,18 +5,200 @@ This module provides web-related tools for the agent.
 """
 
 import os
-import re
 import json
 import logging
+import time
 import asyncio
+import importlib.util
 import aiohttp
-from typing import Dict, List, Any, Optional
+import aiofiles
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from functools import lru_cache, partial
+from typing import Dict, List, Any, Optional, Awaitable, Callable, Hashable
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
+import lxml.html
+from lxml import etree
 from bs4 import BeautifulSoup
 from utils.logger import get_logger
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Parser for page HTML; the text is handed over as UTF-8 bytes because lxml
+# rejects str input that carries an XML encoding declaration
+_HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# Substrings of an id or class that mark an element as the main content
+_CONTENT_IDS = ("content", "main", "article", "post", "entry", "blog")
+
+
+def _has_content_id(value: Optional[str]) -> bool:
+    """Check whether an id or class attribute mentions a content identifier."""
+    if not value:
+        return False
+    value = value.lower()
+    return any(content_id in value for content_id in _CONTENT_IDS)
+
+
+def _contains_content_id(attribute: str) -> str:
+    """Build an XPath test for a content identifier in an attribute, ignoring case."""
+    lowered = f"translate({attribute}, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    return " or ".join(f"contains({lowered}, '{content_id}')" for content_id in _CONTENT_IDS)
+
+
+# Every element whose id or class mentions a content identifier, plus every
+# <article>, in document order. Plain XPath string functions keep the whole
+# walk inside libxml2; the winner is then picked in Python.
+_CONTENT_CANDIDATES_XPATH = etree.XPath(
+    f"//*[{_contains_content_id('@id')} or {_contains_content_id('@class')} or self::article]"
+)
+
+# Anchors with a non-empty, non-javascript href
+_LINKS_XPATH = etree.XPath("//a[@href != '' and not(starts-with(@href, 'javascript:'))]")
+
+# Paragraphs and headings, in document order
+_TEXT_BLOCKS_XPATH = etree.XPath(".//p|.//h1|.//h2|.//h3|.//h4|.//h5|.//h6")
+
+_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# aiohttp can only decode brotli responses when a brotli binding is installed
+if any(importlib.util.find_spec(module) for module in ("brotli", "brotlicffi")):
+    _ACCEPT_ENCODING = "br, gzip, deflate"
+else:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+# Chunk size for streaming downloads to disk, and aiohttp's receive buffer
+_DOWNLOAD_CHUNK_SIZE = 1 << 18
+_READ_BUFSIZE = 1 << 20
+
+# Maximum number of pages fetched at once by browse_many
+_BROWSE_CONCURRENCY = 16
+
+# Result caches: (max entries, seconds to live)
+_BROWSE_CACHE_SIZE, _BROWSE_CACHE_TTL = 512, 600
+_SEARCH_CACHE_SIZE, _SEARCH_CACHE_TTL = 256, 300
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Largest HTML body browse() will download and parse
+MAX_HTML_BYTES = int(os.getenv("MAX_HTML_BYTES", str(4 << 20)))
+
+# One HTTP session is shared by the whole process so that connections,
+# TLS sessions and DNS lookups are reused across calls
+_SESSION: Optional[aiohttp.ClientSession] = None
+_SESSION_LOCK = asyncio.Lock()
+
+
+async def _get_shared_session() -> aiohttp.ClientSession:
+    """
+    Get the process-wide aiohttp session, creating it on first use.
+    
+    Returns:
+        An aiohttp.ClientSession instance
+    """
+    global _SESSION
+    
+    if _SESSION is not None and not _SESSION.closed:
+        return _SESSION
+    
+    async with _SESSION_LOCK:
+        if _SESSION is None or _SESSION.closed:
+            connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=32,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
+            )
+            _SESSION = aiohttp.ClientSession(
+                headers={"User-Agent": _USER_AGENT, "Accept-Encoding": _ACCEPT_ENCODING},
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30)
+            )
+    
+    return _SESSION
+
+
+async def close_session():
+    """Close the shared HTTP session and drain its keep-alive connections."""
+    global _SESSION
+    
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+
+def _normalize_url(url: str) -> str:
+    """
+    Normalize a URL for use as a cache key.
+    
+    The scheme and host are lowercased, default ports are dropped, query
+    parameters are sorted and the fragment is removed.
+    
+    Args:
+        url: The URL to normalize
+        
+    Returns:
+        The normalized URL
+    """
+    try:
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        
+        userinfo, at, host = parts.netloc.rpartition("@")
+        host = host.lower()
+        if parts.port is not None and parts.port == _DEFAULT_PORTS.get(scheme):
+            host = host.rsplit(":", 1)[0]
+        
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        
+        return urlunsplit((scheme, f"{userinfo}{at}{host}", parts.path or "/", query, ""))
+    except ValueError:
+        return url
+
+
+class _TTLCache:
+    """A small LRU cache whose entries expire after a fixed time."""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a live entry, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store an entry, evicting the least recently used one if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
 
 class WebTools:
     """Provides web-related tools for the agent."""
@@ -24,24 +206,83 @@ class WebTools:
     def __init__(self):
         """Initialize the web tools."""
         self.logger = get_logger(__name__)
-        self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        self.session = None
+        self.user_agent = _USER_AGENT
+        self._browse_cache = _TTLCache(_BROWSE_CACHE_SIZE, _BROWSE_CACHE_TTL)
+        self._search_cache = _TTLCache(_SEARCH_CACHE_SIZE, _SEARCH_CACHE_TTL)
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
     
     async def _get_session(self) -> aiohttp.ClientSession:
         """
-        Get an aiohttp session.
+        Get the shared aiohttp session.
         
         Returns:
             An aiohttp.ClientSession instance
         """
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(headers={"User-Agent": self.user_agent})
-        return self.session
+        return await _get_shared_session()
+    
+    async def _cached(
+        self,
+        cache: _TTLCache,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Serve a result from the cache, or fetch it once for all concurrent callers.
+        
+        Args:
+            cache: The cache to use
+            key: The cache key
+            fetch: Coroutine function producing the result on a miss
+            
+        Returns:
+            A copy of the result with a "cache_status" of "HIT" or "MISS"
+        """
+        result = cache.get(key)
+        if result is not None:
+            return dict(result, cache_status="HIT")
+        
+        # Identical requests already in progress share the same fetch
+        future = self._in_flight.get(key)
+        status = "HIT"
+        
+        if future is None:
+            status = "MISS"
+            future = asyncio.ensure_future(fetch())
+            self._in_flight[key] = future
+            future.add_done_callback(partial(self._fetch_done, cache, key))
+        
+        result = await asyncio.shield(future)
+        return dict(result, cache_status=status)
+    
+    def _fetch_done(self, cache: _TTLCache, key: Hashable, future: asyncio.Future):
+        """Cache a finished fetch if it succeeded."""
+        self._in_flight.pop(key, None)
+        
+        if future.cancelled() or future.exception() is not None:
+            return
+        
+        result = future.result()
+        if result.get("success"):
+            cache.set(key, result)
     
     async def search(self, query: str, num_results: int = 5) -> Dict[str, Any]:
         """
         Search the web using a search engine API.
         
+        Args:
+            query: The search query
+            num_results: Number of results to return
+            
+        Returns:
+            A dictionary with search results
+        """
+        key = ("search", " ".join(query.split()), num_results)
+        return await self._cached(self._search_cache, key, partial(self._search, query, num_results))
+    
+    async def _search(self, query: str, num_results: int = 5) -> Dict[str, Any]:
+        """
+        Search the web without consulting the cache.
+        
         Args:
             query: The search query
             num_results: Number of results to return
@@ -72,7 +313,7 @@ class WebTools:
                     self.logger.error(f"SerpAPI error: {response.status}")
                     return await self._simple_search(query, num_results)
                 
-                data = await response.json()
+                data = await response.json(loads=_json_loads, content_type=None)
                 
                 # Extract organic results
                 results = []
@@ -168,6 +409,19 @@ class WebTools:
         """
         Browse a web page and extract its content.
         
+        Args:
+            url: The URL to browse
+            
+        Returns:
+            A dictionary with the page content
+        """
+        key = ("browse", _normalize_url(url))
+        return await self._cached(self._browse_cache, key, partial(self._browse, url))
+    
+    async def _browse(self, url: str) -> Dict[str, Any]:
+        """
+        Browse a web page without consulting the cache.
+        
         Args:
             url: The URL to browse
             
@@ -200,25 +454,22 @@ class WebTools:
                         "title": url
                     }
                 
-                html = await response.text()
-                
-                # Parse the HTML
-                soup = BeautifulSoup(html, "html.parser")
-                
-                # Extract the title
-                title = soup.title.text.strip() if soup.title else url
+                html = await self._read_html(response)
+                if html is None:
+                    return {
+                        "success": False,
+                        "error": f"Page exceeds the {MAX_HTML_BYTES} byte limit"
+                    }
                 
-                # Extract readable content
-                article_text = self._extract_article_text(soup)
+                # Parse the page off the event loop
+                page = await asyncio.to_thread(self._parse_page, html, url)
                 
                 return {
                     "success": True,
                     "url": url,
                     "content_type": content_type,
                     "is_html": True,
-                    "text": article_text,
-                    "title": title,
-                    "links": self._extract_links(soup, url)
+                    **page
                 }
         
         except Exception as e:
@@ -228,99 +479,164 @@ class WebTools:
                 "error": str(e)
             }
     
-    def _extract_article_text(self, soup: BeautifulSoup) -> str:
+    async def _read_html(self, response: aiohttp.ClientResponse) -> Optional[str]:
         """
-        Extract the main article text from a web page.
+        Read and decode an HTML response body, up to MAX_HTML_BYTES.
         
         Args:
-            soup: The BeautifulSoup object
+            response: The response to read
             
         Returns:
-            The extracted text
+            The decoded HTML, or None if the body is too large
         """
-        # Try to identify main content
-        main_content = None
+        if response.content_length is not None and response.content_length > MAX_HTML_BYTES:
+            return None
         
-        # Common content identifiers
-        content_ids = ["content", "main", "article", "post", "entry", "blog"]
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+            body += chunk
+            if len(body) > MAX_HTML_BYTES:
+                return None
         
-        # Try to find main content by ID
-        for content_id in content_ids:
-            main_content = soup.find(id=re.compile(content_id, re.I))
-            if main_content:
-                break
+        try:
+            return body.decode(response.charset or "utf-8", errors="replace")
+        except LookupError:
+            # Unknown charset in the Content-Type header
+            return body.decode("utf-8", errors="replace")
+    
+    async def browse_many(self, urls: List[str]) -> Dict[str, Any]:
+        """
+        Browse several web pages concurrently.
         
-        # Try to find main content by class
-        if not main_content:
-            for content_id in content_ids:
-                main_content = soup.find(class_=re.compile(content_id, re.I))
-                if main_content:
-                    break
+        Args:
+            urls: The URLs to browse
+            
+        Returns:
+            A dictionary with one browse result per URL, in order
+        """
+        semaphore = asyncio.Semaphore(_BROWSE_CONCURRENCY)
+        
+        async def browse_one(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.browse(url)
+        
+        results = await asyncio.gather(*(browse_one(url) for url in urls), return_exceptions=True)
         
-        # Try to find main content by tag
-        if not main_content:
-            main_content = soup.find("article")
+        return {
+            "success": True,
+            "results": [
+                {"success": False, "url": url, "error": str(result)} if isinstance(result, BaseException) else result
+                for url, result in zip(urls, results)
+            ]
+        }
+    
+    def _parse_page(self, html: str, url: str) -> Dict[str, Any]:
+        """
+        Parse a page and extract its title, text and links.
+        
+        Args:
+            html: The page HTML
+            url: The page URL
+            
+        Returns:
+            A dictionary with the page's text, title and links
+        """
+        tree = self._parse_html(html)
+        
+        # Extract the title
+        title_elem = tree.find(".//title")
+        title = title_elem.text_content().strip() if title_elem is not None else url
+        
+        # Extract readable content
+        article_text = self._extract_article_text(tree)
+        
+        return {
+            "text": article_text,
+            "title": title,
+            "links": self._extract_links(tree, url)
+        }
+    
+    def _parse_html(self, html: str) -> lxml.html.HtmlElement:
+        """
+        Parse an HTML page.
+        
+        Args:
+            html: The page HTML
+            
+        Returns:
+            The root element of the document (an empty <html> if there is none)
+        """
+        try:
+            return lxml.html.document_fromstring(html.encode("utf-8"), parser=_HTML_PARSER)
+        except etree.ParserError:
+            # Empty or comment-only document
+            return lxml.html.Element("html")
+    
+    def _extract_article_text(self, tree: lxml.html.HtmlElement) -> str:
+        """
+        Extract the main article text from a web page.
+        
+        Args:
+            tree: The parsed page
+            
+        Returns:
+            The extracted text
+        """
+        # Try to find main content by ID, then by class, then by tag
+        main_content = by_class = by_tag = None
+        for element in _CONTENT_CANDIDATES_XPATH(tree):
+            if _has_content_id(element.get("id")):
+                main_content = element
+                break
+            if by_class is None and _has_content_id(element.get("class")):
+                by_class = element
+            elif by_tag is None and element.tag == "article":
+                by_tag = element
+        
+        if main_content is None:
+            main_content = by_class if by_class is not None else by_tag
         
         # If still no main content, use the body
-        if not main_content:
-            main_content = soup.body
+        if main_content is None:
+            main_content = tree.find(".//body")
         
-        # If still nothing, just use the whole soup
-        if not main_content:
-            main_content = soup
+        # If still nothing, just use the whole document
+        if main_content is None:
+            main_content = tree
         
         # Remove script, style, and iframe tags
-        for tag in main_content.find_all(["script", "style", "iframe"]):
-            tag.decompose()
+        etree.strip_elements(main_content, "script", "style", "iframe", with_tail=False)
         
         # Get the text
-        text = ""
-        for paragraph in main_content.find_all(["p", "h1", "h2", "h3", "h4", "h5", "h6"]):
-            text += paragraph.text.strip() + "\n\n"
+        parts = [paragraph.text_content().strip() for paragraph in _TEXT_BLOCKS_XPATH(main_content)]
+        text = "\n\n".join(part for part in parts if part)
         
         # If we didn't find any paragraphs, just get all the text
         if not text:
-            text = main_content.get_text(separator="\n", strip=True)
+            text = "\n".join(s.strip() for s in main_content.itertext() if s.strip())
         
         return text
     
-    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
+    def _extract_links(self, tree: lxml.html.HtmlElement, base_url: str) -> List[Dict[str, str]]:
         """
         Extract links from a web page.
         
         Args:
-            soup: The BeautifulSoup object
+            tree: The parsed page
             base_url: The base URL
             
         Returns:
             A list of links
         """
-        links = []
+        anchors = _LINKS_XPATH(tree)
         
-        for a_tag in soup.find_all("a", href=True):
-            href = a_tag["href"]
-            text = a_tag.text.strip()
-            
-            # Skip empty or javascript links
-            if not href or href.startswith("javascript:"):
-                continue
-            
-            # Make relative URLs absolute
-            if href.startswith("/"):
-                parsed_url = urlparse(base_url)
-                href = f"{parsed_url.scheme}://{parsed_url.netloc}{href}"
-            elif not href.startswith("http"):
-                # Handle relative paths without leading slash
-                if not base_url.endswith("/"):
-                    base_url += "/"
-                href = f"{base_url}{href}"
-            
-            links.append({
-                "url": href,
-                "text": text
-            })
+        # Resolve relative URLs (including ../ paths and <base href>) in one pass
+        tree.make_links_absolute(base_url, resolve_base_href=True, handle_failures="ignore")
         
-        return links
+        return [
+            {"url": a_tag.get("href"), "text": a_tag.text_content().strip()}
+            for a_tag in anchors
+        ]
     
     async def download(self, url: str, path: str) -> Dict[str, Any]:
         """
@@ -334,6 +650,12 @@ class WebTools:
             A dictionary with the result
         """
         file_path = Path(path)
+        part_path = file_path.with_name(file_path.name + ".part")
+        
+        # Source URL and validators of the partial file if there is one, else
+        # of the file at path; conditional and range requests are only sent
+        # for the same URL
+        meta_path = file_path.with_name(file_path.name + ".meta")
         
         try:
             session = await self._get_session()
@@ -344,24 +666,87 @@ class WebTools:
             # Create parent directories if they don't exist
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Download the file
-            async with session.get(url, timeout=timeout) as response:
-                if response.status != 200:
-                    return {
-                        "success": False,
-                        "error": f"Failed to download file: {response.status}"
-                    }
+            # A rejected resume drops the partial file and tries once more
+            for attempt in range(2):
+                headers = {}
+                offset = 0
                 
-                # Get content type
-                content_type = response.headers.get("Content-Type", "")
+                meta = _read_download_meta(meta_path)
+                validator = meta.get("etag") or meta.get("last_modified")
+                same_source = meta.get("url") == url and validator is not None
+                
+                if part_path.exists():
+                    if same_source:
+                        # Resume an interrupted download, unless the file
+                        # changed on the server since it started
+                        offset = part_path.stat().st_size
+                        if offset:
+                            headers["Range"] = f"bytes={offset}-"
+                            headers["If-Range"] = validator
+                            headers["Accept-Encoding"] = "identity"
+                    else:
+                        # A partial file from another URL can't be resumed
+                        part_path.unlink()
+                elif same_source and file_path.exists():
+                    # Revalidate the copy we already have
+                    if meta.get("etag"):
+                        headers["If-None-Match"] = meta["etag"]
+                    if meta.get("last_modified"):
+                        headers["If-Modified-Since"] = meta["last_modified"]
+                
+                # Download the file
+                async with session.get(url, headers=headers, timeout=timeout, read_bufsize=_READ_BUFSIZE) as response:
+                    # Get content type
+                    content_type = response.headers.get("Content-Type", "")
+                    
+                    if response.status == 304:
+                        return {
+                            "success": True,
+                            "url": url,
+                            "path": str(file_path),
+                            "content_type": content_type,
+                            "size": file_path.stat().st_size,
+                            "not_modified": True
+                        }
+                    
+                    resumed = (
+                        response.status == 206
+                        and offset > 0
+                        and response.headers.get("Content-Range", "").startswith(f"bytes {offset}-")
+                    )
+                    
+                    if offset and not resumed and response.status in (206, 416):
+                        # The sidecar describes the dropped partial file, not
+                        # the file at path
+                        part_path.unlink(missing_ok=True)
+                        meta_path.unlink(missing_ok=True)
+                        continue
+                    
+                    if response.status != 200 and not resumed:
+                        return {
+                            "success": False,
+                            "error": f"Failed to download file: {response.status}"
+                        }
+                    
+                    # Save the file without blocking the event loop
+                    async with aiofiles.open(part_path, "ab" if resumed else "wb") as f:
+                        if not resumed:
+                            # Record the source once the partial file exists,
+                            # so an interrupted download resumes from the same
+                            # URL and version
+                            meta = {
+                                "url": url,
+                                "etag": response.headers.get("ETag"),
+                                "last_modified": response.headers.get("Last-Modified")
+                            }
+                            async with aiofiles.open(meta_path, "w", encoding="utf-8") as meta_file:
+                                await meta_file.write(json.dumps(meta))
+                        
+                        async for chunk in response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                            await f.write(chunk)
                 
-                # Save the file
-                with open(file_path, "wb") as f:
-                    while True:
-                        chunk = await response.content.read(8192)
-                        if not chunk:
-                            break
-                        f.write(chunk)
+                os.replace(part_path, file_path)
+                _set_mtime_from_last_modified(file_path, meta.get("last_modified"))
                 
                 return {
                     "success": True,
@@ -370,6 +755,11 @@ class WebTools:
                     "content_type": content_type,
                     "size": file_path.stat().st_size
                 }
+            
+            return {
+                "success": False,
+                "error": "Failed to download file: the server rejected the resumed range"
+            }
         
         except Exception as e:
             self.logger.error(f"Error downloading {url}: {str(e)}")
@@ -380,14 +770,54 @@ class WebTools:
     
     async def close(self):
         """Close the session."""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        await close_session()
 
 
+def _read_download_meta(meta_path: Path) -> Dict[str, Any]:
+    """
+    Read the sidecar recording where a downloaded file came from.
+    
+    Args:
+        meta_path: The sidecar path
+        
+    Returns:
+        The recorded url, etag and last_modified, or an empty dict if there
+        is no usable sidecar
+    """
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return meta if isinstance(meta, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _set_mtime_from_last_modified(file_path: Path, last_modified: Optional[str]):
+    """
+    Set a downloaded file's mtime to the server's Last-Modified time.
+    
+    Args:
+        file_path: The downloaded file
+        last_modified: The Last-Modified header value, if any
+    """
+    if not last_modified:
+        return
+    
+    try:
+        timestamp = parsedate_to_datetime(last_modified).timestamp()
+    except (TypeError, ValueError):
+        return
+    
+    os.utime(file_path, (timestamp, timestamp))
+
+
+@lru_cache(maxsize=1)
 def get_web_tools() -> Dict[str, Any]:
     """
     Get the web tools.
     
+    A single shared instance is built on first use.
+    
     Returns:
         A dictionary of web tool functions
     """
@@ -396,5 +826,6 @@ def get_web_tools() -> Dict[str, Any]:
     return {
         "search": tools.search,
         "browse": tools.browse,
+        "browse_many": tools.browse_many,
         "download": tools.download
     }
\ No newline at end of file
@@ -10,6 +10,7 @@ import os
 import sys
 import logging
 import argparse
+import importlib.util
 from dotenv import load_dotenv
 
 # Add the project root to the Python path
@@ -66,10 +67,19 @@ def main():
     
     logger.info("Starting Local Scout AI Agent...")
     
-    # Import necessary components
+    # Tasks live in the agent's memory, so every web worker would see its
+    # own tasks and schedules; run a single worker until they are shared
+    if int(os.getenv("WEB_WORKERS", "1")) > 1:
+        logger.warning("WEB_WORKERS > 1 is not supported while tasks are kept in memory; starting a single web worker")
+    
+    # Prefer the libuv event loop and the C HTTP parser when installed
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    
+    # Import the components this process runs; the web stack is only
+    # imported when the web server is started
     from core.agent import ScoutAgent
     from scheduler.scheduler import TaskScheduler
-    from api.app import create_app
     
     # Initialize the agent
     logger.info("Initializing AI agent...")
@@ -87,6 +97,7 @@ def main():
     # Start web server if not scheduler-only mode
     if not args.scheduler_only:
         logger.info(f"Starting web server on {args.host}:{args.port}...")
+        from api.app import create_app
         app = create_app(agent, scheduler)
         
         import uvicorn
@@ -94,18 +105,23 @@ def main():
             app, 
             host=args.host, 
             port=args.port, 
-            log_level="debug" if args.debug else "info"
+            log_level="debug" if args.debug else "info",
+            loop=loop,
+            http=http
         )
     else:
-        # If only running the scheduler, keep the main thread alive
-        import time
-        try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            logger.info("Stopping scheduler...")
-            scheduler.shutdown()
-            logger.info("Scheduler stopped.")
+        # If only running the scheduler, block the main thread until a stop signal
+        import signal
+        import threading
+        
+        stop = threading.Event()
+        signal.signal(signal.SIGINT, lambda *_: stop.set())
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        stop.wait()
+        
+        logger.info("Stopping scheduler...")
+        scheduler.shutdown()
+        logger.info("Scheduler stopped.")
 
 
 if __name__ == "__main__":
@@ -5,7 +5,9 @@ This package provides task scheduling capabilities for the agent.
 """
 
 from scheduler.scheduler import TaskScheduler
+from scheduler.view import ScheduleView
 
 __all__ = [
     "TaskScheduler",
+    "ScheduleView",
 ]
\ No newline at end of file
@@ -6,14 +6,198 @@ This module provides persistence capabilities for the task scheduler.
 
 import os
 import json
+import time
+import queue
+import atexit
 import logging
 import sqlite3
-from typing import Dict, List, Any, Optional, Set
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 
 from utils.logger import get_logger
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Bound once; log_task_run converts two datetimes per call
+_ts = datetime.timestamp
+
+# Store datetimes as ISO strings, converted in sqlite3's parameter binding
+sqlite3.register_adapter(datetime, datetime.isoformat)
+
+# Maximum number of pooled read connections
+_MAX_READERS = int(os.getenv("SCHEDULER_DB_READERS", "4"))
+
+
+# Fixed SQL statements; reusing the same strings lets each connection's
+# statement cache skip re-parsing them
+_UPSERT_SCHEDULE_SQL = (
+    "INSERT INTO schedules (task_id, job_id, schedule_type, schedule_value, next_run_time) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(task_id) DO UPDATE SET job_id = excluded.job_id, schedule_type = excluded.schedule_type, "
+    "schedule_value = excluded.schedule_value, next_run_time = excluded.next_run_time"
+)
+_MIGRATE_SCHEDULE_SQL = (
+    "INSERT INTO schedules (task_id, job_id, schedule_type, schedule_value, next_run_time) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(task_id) DO NOTHING"
+)
+_DELETE_SCHEDULE_SQL = "DELETE FROM schedules WHERE task_id = ?"
+_SELECT_SCHEDULE_SQL = "SELECT * FROM schedules WHERE task_id = ?"
+_SELECT_SCHEDULE_TUPLE_SQL = (
+    "SELECT task_id, job_id, schedule_type, schedule_value, next_run_time FROM schedules WHERE task_id = ?"
+)
+_SELECT_ALL_SCHEDULES_SQL = "SELECT * FROM schedules"
+# Schedules except "at:" dates that have passed; unparseable dates are kept.
+# Dates are compared in UTC: julianday() converts dates with an offset to UTC
+# itself, and naive dates are local time, converted with the 'utc' modifier
+_SELECT_ACTIVE_SCHEDULES_SQL = (
+    "SELECT * FROM schedules WHERE NOT ("
+    "schedule_type = 'date' AND schedule_value LIKE 'at:%' "
+    "AND coalesce(("
+    "SELECT CASE WHEN run_date GLOB '*[+-][0-9][0-9]:[0-9][0-9]' OR run_date GLOB '*[Zz]' "
+    "THEN julianday(run_date) ELSE julianday(run_date, 'utc') END "
+    "FROM (SELECT trim(substr(schedule_value, 4)) AS run_date)"
+    ") <= julianday(?), 0))"
+)
+_INSERT_TASK_RUN_SQL = "INSERT INTO task_runs (task_id, status, start_time, end_time, error) VALUES (?, ?, ?, ?, ?)"
+_SELECT_TASK_RUNS_SQL = "SELECT * FROM task_runs WHERE task_id = ? ORDER BY start_time DESC LIMIT ?"
+_DELETE_OLD_RUNS_SQL = (
+    "DELETE FROM task_runs WHERE rowid IN "
+    "(SELECT rowid FROM task_runs WHERE start_time < ? LIMIT ?)"
+)
+
+# Rows removed per cleanup transaction, bounding how long the write lock is held
+_CLEANUP_BATCH_SIZE = 1000
+
+# Schema version recorded in PRAGMA user_version; bump it when the DDL changes
+_SCHEMA_VERSION = 2
+
+# Databases before user_version 1 stored run times as local ISO-8601 strings;
+# convert them to unix epoch milliseconds
+_BACKFILL_RUN_TIMES_SQL = (
+    "UPDATE task_runs SET "
+    "start_time = CASE WHEN typeof(start_time) = 'text' "
+    "THEN CAST(round((julianday(start_time, 'utc') - 2440587.5) * 86400000) AS INTEGER) ELSE start_time END, "
+    "end_time = CASE WHEN typeof(end_time) = 'text' "
+    "THEN CAST(round((julianday(end_time, 'utc') - 2440587.5) * 86400000) AS INTEGER) ELSE end_time END "
+    "WHERE typeof(start_time) = 'text' OR typeof(end_time) = 'text'"
+)
+
+# Prepared statements kept per connection
+_CACHED_STATEMENTS = 128
+
+# Task runs are written in batches of up to this many rows, or whatever
+# arrived within the flush interval (seconds) of the first queued row
+_RUN_BATCH_SIZE = 500
+_RUN_FLUSH_INTERVAL = 0.25
+
+# Queued to stop the task run flusher thread
+_STOP_FLUSHER = object()
+
+# Legacy JSON files larger than this are migrated on a background thread
+_BACKGROUND_MIGRATION_BYTES = 1_000_000
+
+# Legacy JSON migration: cron trigger fields in expression order, and
+# interval units from largest to smallest
+_CRON_FIELDS = ("minute", "hour", "day", "month", "day_of_week")
+_INTERVAL_UNITS = ((86400, "d"), (3600, "h"), (60, "m"), (1, "s"))
+
+
+def _ms_to_iso(value: Optional[int]) -> Optional[str]:
+    """
+    Convert a stored run time to a local ISO-8601 string.
+    
+    Args:
+        value: Unix epoch milliseconds, or None
+        
+    Returns:
+        The ISO-8601 string, or None
+    """
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value / 1000).isoformat()
+
+
+class _ConnectionPool:
+    """A single serialized writer connection plus a pool of reader connections."""
+    
+    def __init__(self, connect: Callable[[], sqlite3.Connection], min_readers: int = 1, max_readers: int = _MAX_READERS):
+        """
+        Initialize the pool.
+        
+        Args:
+            connect: Factory for new connections
+            min_readers: Number of reader connections opened up front
+            max_readers: Maximum number of reader connections
+        """
+        self._connect = connect
+        self._max_readers = max(max_readers, min_readers, 1)
+        self._idle: queue.Queue = queue.Queue(maxsize=self._max_readers)
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        
+        self._writer = connect()
+        self._write_lock = threading.Lock()
+        
+        for _ in range(min_readers):
+            self._idle.put(self._new_reader())
+    
+    def _new_reader(self) -> sqlite3.Connection:
+        """Open a reader connection and track it for closing."""
+        conn = self._connect()
+        self._readers.append(conn)
+        return conn
+    
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a reader connection.
+        
+        Yields:
+            A connection to run queries on
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._readers_lock:
+                conn = self._new_reader() if len(self._readers) < self._max_readers else None
+            if conn is None:
+                conn = self._idle.get()
+        
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+    
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """
+        Hold the writer connection exclusively.
+        
+        Yields:
+            The writer connection
+        """
+        with self._write_lock:
+            try:
+                yield self._writer
+            finally:
+                # Never leave a failed transaction open for the next writer
+                if self._writer.in_transaction:
+                    self._writer.rollback()
+    
+    def close(self):
+        """Close all connections."""
+        with self._write_lock:
+            self._writer.close()
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+
 
 class SchedulerPersistence:
     """Provides persistence capabilities for the task scheduler."""
@@ -42,20 +226,100 @@ class SchedulerPersistence:
         # Legacy JSON file for backwards compatibility
         self.json_file = self.persistence_path / "scheduled_tasks.json"
         
+        # WAL mode is stored in the database file, so it only needs setting once
+        self._wal_initialized = False
+        
+        # Connection pool shared by all methods
+        self._pool = _ConnectionPool(self._connect)
+        
         # Initialize the database
         self._init_db()
         
-        # Migrate from JSON if needed
-        self._migrate_from_json()
+        # Migrate from JSON if needed, in the background for large files
+        self._migration_thread: Optional[threading.Thread] = None
+        if self.json_file.exists() and self.json_file.stat().st_size > _BACKGROUND_MIGRATION_BYTES:
+            self._migration_thread = threading.Thread(target=self._migrate_from_json, name="scheduler-json-migration", daemon=True)
+            self._migration_thread.start()
+        else:
+            self._migrate_from_json()
+        
+        # Task runs are queued and written in batches by a background thread
+        self._run_queue: queue.Queue = queue.Queue()
+        self._flusher = threading.Thread(target=self._flush_task_runs, name="scheduler-run-flusher", daemon=True)
+        self._flusher.start()
+        self._closed = False
+        atexit.register(self.close)
         
         self.logger.info(f"Scheduler persistence initialized at {self.persistence_path}")
     
-    def _init_db(self):
-        """Initialize the SQLite database."""
-        try:
-            conn = sqlite3.connect(self.db_file)
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection to the database with tuned PRAGMAs.
+        
+        Returns:
+            A SQLite connection in autocommit mode
+        """
+        conn = sqlite3.connect(
+            self.db_file,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=_CACHED_STATEMENTS
+        )
+        
+        if not self._wal_initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._wal_initialized = True
+        
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA wal_autocheckpoint=2000")
+        
+        return conn
+    
+    @contextmanager
+    def _txn(self, write: bool, action: str) -> Iterator[Tuple[sqlite3.Connection, sqlite3.Cursor]]:
+        """
+        Run database work on a pooled connection.
+        
+        Writes run inside BEGIN IMMEDIATE ... COMMIT and are rolled back on
+        failure. Errors in the work are logged rather than raised, so callers
+        fall through to their default result after the with block. Errors
+        setting up the connection or transaction, such as a locked database,
+        are raised to the caller, since the work never ran.
+        
+        Args:
+            write: Whether the work writes to the database
+            action: Description of the work for error messages
+            
+        Yields:
+            The connection and a cursor on it
+        """
+        with (self._pool.writer() if write else self._pool.reader()) as conn:
             cursor = conn.cursor()
+            if write:
+                cursor.execute("BEGIN IMMEDIATE")
             
+            try:
+                yield conn, cursor
+                
+                if write:
+                    conn.commit()
+            except Exception as e:
+                self.logger.error(f"Error {action}: {str(e)}")
+    
+    def _init_db(self):
+        """Initialize the SQLite database."""
+        version = None
+        with self._txn(False, "reading schema version") as (conn, cursor):
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        
+        # Skip the DDL entirely when the schema is already current
+        if version == _SCHEMA_VERSION:
+            self.logger.debug("Database schema is up to date")
+            return
+        
+        with self._txn(True, "initializing database") as (conn, cursor):
             # Create schedules table
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS schedules (
@@ -76,49 +340,45 @@ class SchedulerPersistence:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 task_id TEXT NOT NULL,
                 status TEXT NOT NULL,
-                start_time TIMESTAMP,
-                end_time TIMESTAMP,
+                start_time INTEGER,
+                end_time INTEGER,
                 error TEXT
             )
             ''')
             
-            conn.commit()
-            conn.close()
+            # Indexes for per-task run history and age-based cleanup
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_runs_task_start ON task_runs(task_id, start_time DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_runs_start_time ON task_runs(start_time)")
+            
+            # Run times are stored as unix epoch milliseconds since version 1
+            if cursor.execute("PRAGMA user_version").fetchone()[0] < 1:
+                cursor.execute(_BACKFILL_RUN_TIMES_SQL)
+            
+            cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
             
             self.logger.debug("Database initialized")
-        except Exception as e:
-            self.logger.error(f"Error initializing database: {str(e)}")
     
     def _migrate_from_json(self):
         """Migrate schedules from JSON file if it exists."""
-        if not self.json_file.exists():
+        # Already migrated on an earlier start
+        if self.json_file.with_suffix(".json.migrated").exists() or not self.json_file.exists():
             return
         
         try:
-            with open(self.json_file, "r") as f:
-                schedules = json.load(f)
+            schedules = _json_loads(self.json_file.read_bytes())
             
             if not schedules:
                 return
             
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
+            rows = []
             
             for task_id, schedule in schedules.items():
-                # Check if already migrated
-                cursor.execute("SELECT COUNT(*) FROM schedules WHERE task_id = ?", (task_id,))
-                if cursor.fetchone()[0] > 0:
-                    continue
-                
                 trigger = schedule.get("trigger", {})
                 schedule_type = trigger.get("type", "unknown")
                 
                 # Convert trigger to schedule value
                 if schedule_type == "cron":
-                    cron_parts = []
-                    for field in ["minute", "hour", "day", "month", "day_of_week"]:
-                        if field in trigger:
-                            cron_parts.append(trigger[field])
+                    cron_parts = [trigger[field] for field in _CRON_FIELDS if field in trigger]
                     
                     if len(cron_parts) == 5:
                         schedule_value = f"cron:{' '.join(cron_parts)}"
@@ -127,20 +387,11 @@ class SchedulerPersistence:
                 
                 elif schedule_type == "interval":
                     seconds = trigger.get("seconds", 0)
-                    if seconds > 0:
-                        if seconds < 60:
-                            schedule_value = f"every {seconds}s"
-                        elif seconds < 3600:
-                            minutes = seconds // 60
-                            schedule_value = f"every {minutes}m"
-                        elif seconds < 86400:
-                            hours = seconds // 3600
-                            schedule_value = f"every {hours}h"
-                        else:
-                            days = seconds // 86400
-                            schedule_value = f"every {days}d"
-                    else:
-                        schedule_value = "unknown"
+                    unit_seconds, unit = next(
+                        ((size, label) for size, label in _INTERVAL_UNITS if seconds >= size),
+                        (None, None)
+                    )
+                    schedule_value = f"every {seconds // unit_seconds}{unit}" if unit_seconds else "unknown"
                 
                 elif schedule_type == "date":
                     run_date = trigger.get("run_date")
@@ -152,20 +403,19 @@ class SchedulerPersistence:
                 else:
                     schedule_value = "unknown"
                 
-                # Insert into database
-                cursor.execute(
-                    "INSERT INTO schedules (task_id, job_id, schedule_type, schedule_value, next_run_time) VALUES (?, ?, ?, ?, ?)",
-                    (
-                        task_id,
-                        schedule.get("job_id", ""),
-                        schedule_type,
-                        schedule_value,
-                        schedule.get("next_run_time")
-                    )
-                )
-            
-            conn.commit()
-            conn.close()
+                rows.append((
+                    task_id,
+                    schedule.get("job_id", ""),
+                    schedule_type,
+                    schedule_value,
+                    schedule.get("next_run_time")
+                ))
+            
+            # Insert everything in one transaction, skipping tasks that were already migrated
+            with self._pool.writer() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(_MIGRATE_SCHEDULE_SQL, rows)
+                conn.commit()
             
             # Rename the JSON file to indicate it was migrated
             self.json_file.rename(self.json_file.with_suffix(".json.migrated"))
@@ -174,6 +424,87 @@ class SchedulerPersistence:
         except Exception as e:
             self.logger.error(f"Error migrating from JSON: {str(e)}")
     
+    def _wait_for_migration(self):
+        """Wait for a background JSON migration so its schedules are visible."""
+        if self._migration_thread is not None:
+            self._migration_thread.join()
+            self._migration_thread = None
+    
+    def _flush_task_runs(self):
+        """Write queued task runs in batches until asked to stop."""
+        while True:
+            item = self._run_queue.get()
+            deadline = time.monotonic() + _RUN_FLUSH_INTERVAL
+            batch, waiters, stop = [], [], False
+            
+            # Collect rows until the batch is full, the interval has passed,
+            # or a flush or stop is requested
+            while True:
+                if item is _STOP_FLUSHER:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                
+                if stop or waiters or len(batch) >= _RUN_BATCH_SIZE:
+                    break
+                
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                
+                try:
+                    item = self._run_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            
+            try:
+                if batch:
+                    self._write_task_runs(batch)
+            finally:
+                # Never leave flush() callers waiting, even if the write failed
+                for waiter in waiters:
+                    waiter.set()
+            
+            if stop:
+                return
+    
+    def _write_task_runs(self, batch: List[tuple]):
+        """
+        Write a batch of task runs in one transaction.
+        
+        Args:
+            batch: Task run rows to insert
+        """
+        try:
+            with self._txn(True, f"writing {len(batch)} task runs") as (conn, cursor):
+                cursor.executemany(_INSERT_TASK_RUN_SQL, batch)
+                self.logger.debug(f"Wrote {len(batch)} task runs")
+        except Exception as e:
+            self.logger.error(f"Error writing {len(batch)} task runs: {str(e)}")
+    
+    def flush(self):
+        """Wait until every task run queued so far has been written."""
+        if not self._flusher.is_alive():
+            return
+        
+        done = threading.Event()
+        self._run_queue.put(done)
+        done.wait()
+    
+    def close(self):
+        """Write pending task runs and close all database connections."""
+        if self._closed:
+            return
+        self._closed = True
+        
+        if self._flusher.is_alive():
+            self._run_queue.put(_STOP_FLUSHER)
+            self._flusher.join()
+        
+        self._pool.close()
+    
     def save_schedule(self, task_id: str, job_id: str, schedule_type: str, schedule_value: str, next_run_time: Optional[datetime] = None):
         """
         Save a schedule to the database.
@@ -185,34 +516,26 @@ class SchedulerPersistence:
             schedule_value: The schedule value
             next_run_time: The next run time
         """
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # Convert datetime to string
-            next_run_time_str = next_run_time.isoformat() if next_run_time else None
-            
-            # Check if the schedule already exists
-            cursor.execute("SELECT COUNT(*) FROM schedules WHERE task_id = ?", (task_id,))
-            if cursor.fetchone()[0] > 0:
-                # Update the existing schedule
-                cursor.execute(
-                    "UPDATE schedules SET job_id = ?, schedule_type = ?, schedule_value = ?, next_run_time = ? WHERE task_id = ?",
-                    (job_id, schedule_type, schedule_value, next_run_time_str, task_id)
-                )
-            else:
-                # Insert a new schedule
-                cursor.execute(
-                    "INSERT INTO schedules (task_id, job_id, schedule_type, schedule_value, next_run_time) VALUES (?, ?, ?, ?, ?)",
-                    (task_id, job_id, schedule_type, schedule_value, next_run_time_str)
-                )
-            
-            conn.commit()
-            conn.close()
-            
+        with self._txn(True, f"saving schedule for task {task_id}") as (conn, cursor):
+            # Insert the schedule, or update it if the task already has one
+            cursor.execute(_UPSERT_SCHEDULE_SQL, (task_id, job_id, schedule_type, schedule_value, next_run_time))
             self.logger.debug(f"Saved schedule for task {task_id}")
-        except Exception as e:
-            self.logger.error(f"Error saving schedule for task {task_id}: {str(e)}")
+    
+    def bulk_save_schedules(self, items: Iterable[Tuple[str, str, str, str, Optional[datetime]]]):
+        """
+        Save many schedules in a single transaction.
+        
+        Args:
+            items: (task_id, job_id, schedule_type, schedule_value, next_run_time) tuples
+        """
+        rows = list(items)
+        
+        if not rows:
+            return
+        
+        with self._txn(True, "saving schedules") as (conn, cursor):
+            cursor.executemany(_UPSERT_SCHEDULE_SQL, rows)
+            self.logger.debug(f"Saved {len(rows)} schedules")
     
     def delete_schedule(self, task_id: str):
         """
@@ -221,18 +544,25 @@ class SchedulerPersistence:
         Args:
             task_id: The task ID
         """
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            cursor.execute("DELETE FROM schedules WHERE task_id = ?", (task_id,))
-            
-            conn.commit()
-            conn.close()
-            
+        with self._txn(True, f"deleting schedule for task {task_id}") as (conn, cursor):
+            cursor.execute(_DELETE_SCHEDULE_SQL, (task_id,))
             self.logger.debug(f"Deleted schedule for task {task_id}")
-        except Exception as e:
-            self.logger.error(f"Error deleting schedule for task {task_id}: {str(e)}")
+    
+    def bulk_delete_schedules(self, task_ids: Iterable[str]):
+        """
+        Delete many schedules in a single transaction.
+        
+        Args:
+            task_ids: The task IDs
+        """
+        rows = [(task_id,) for task_id in task_ids]
+        
+        if not rows:
+            return
+        
+        with self._txn(True, "deleting schedules") as (conn, cursor):
+            cursor.executemany(_DELETE_SCHEDULE_SQL, rows)
+            self.logger.debug(f"Deleted {len(rows)} schedules")
     
     def get_schedule(self, task_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -244,27 +574,62 @@ class SchedulerPersistence:
         Returns:
             The schedule or None if not found
         """
-        try:
-            conn = sqlite3.connect(self.db_file)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                "SELECT * FROM schedules WHERE task_id = ?",
-                (task_id,)
-            )
-            
+        self._wait_for_migration()
+        
+        row = None
+        with self._txn(False, f"getting schedule for task {task_id}") as (conn, cursor):
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(_SELECT_SCHEDULE_SQL, (task_id,))
             row = cursor.fetchone()
-            conn.close()
-            
-            if row:
-                return dict(row)
-            else:
-                return None
-        except Exception as e:
-            self.logger.error(f"Error getting schedule for task {task_id}: {str(e)}")
+        
+        if row:
+            return dict(row)
+        else:
             return None
     
+    def get_schedule_tuple(self, task_id: str) -> Optional[Tuple[str, str, str, str, Optional[str]]]:
+        """
+        Get a schedule from the database as a plain tuple.
+        
+        Cheaper than get_schedule for hot paths that only need a few fields.
+        
+        Args:
+            task_id: The task ID
+            
+        Returns:
+            (task_id, job_id, schedule_type, schedule_value, next_run_time)
+            or None if not found
+        """
+        self._wait_for_migration()
+        
+        row = None
+        with self._txn(False, f"getting schedule for task {task_id}") as (conn, cursor):
+            cursor.execute(_SELECT_SCHEDULE_TUPLE_SQL, (task_id,))
+            row = cursor.fetchone()
+        
+        return row
+    
+    def iter_all_schedules(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all schedules in the database.
+        
+        Rows are fetched in batches, and a reader connection is held until
+        the iteration finishes.
+        
+        Yields:
+            Each schedule
+        """
+        self._wait_for_migration()
+        
+        with self._txn(False, "getting all schedules") as (conn, cursor):
+            cursor.row_factory = sqlite3.Row
+            cursor.arraysize = 200
+            cursor.execute(_SELECT_ALL_SCHEDULES_SQL)
+            
+            while rows := cursor.fetchmany():
+                for row in rows:
+                    yield dict(row)
+    
     def get_all_schedules(self) -> List[Dict[str, Any]]:
         """
         Get all schedules from the database.
@@ -272,20 +637,27 @@ class SchedulerPersistence:
         Returns:
             A list of schedules
         """
-        try:
-            conn = sqlite3.connect(self.db_file)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT * FROM schedules")
-            
-            rows = cursor.fetchall()
-            conn.close()
+        return list(self.iter_all_schedules())
+    
+    def get_all_active_schedules(self, now: datetime) -> List[Dict[str, Any]]:
+        """
+        Get all schedules that can still run, filtering out past dates in SQL.
+        
+        Args:
+            now: The current time as a naive UTC datetime
             
-            return [dict(row) for row in rows]
-        except Exception as e:
-            self.logger.error(f"Error getting all schedules: {str(e)}")
-            return []
+        Returns:
+            A list of schedules
+        """
+        self._wait_for_migration()
+        
+        schedules = []
+        with self._txn(False, "getting active schedules") as (conn, cursor):
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(_SELECT_ACTIVE_SCHEDULES_SQL, (now,))
+            schedules = [dict(row) for row in cursor.fetchall()]
+        
+        return schedules
     
     def log_task_run(self, task_id: str, status: str, start_time: datetime, end_time: Optional[datetime] = None, error: Optional[str] = None):
         """
@@ -299,20 +671,12 @@ class SchedulerPersistence:
             error: Any error message
         """
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # Convert datetimes to strings
-            start_time_str = start_time.isoformat() if start_time else None
-            end_time_str = end_time.isoformat() if end_time else None
+            # Convert datetimes to unix epoch milliseconds
+            start_time_ms = int(_ts(start_time) * 1000) if start_time else None
+            end_time_ms = int(_ts(end_time) * 1000) if end_time else None
             
-            cursor.execute(
-                "INSERT INTO task_runs (task_id, status, start_time, end_time, error) VALUES (?, ?, ?, ?, ?)",
-                (task_id, status, start_time_str, end_time_str, error)
-            )
-            
-            conn.commit()
-            conn.close()
+            # Written in the next batch by the flusher thread
+            self._run_queue.put((task_id, status, start_time_ms, end_time_ms, error))
             
             self.logger.debug(f"Logged task run for task {task_id}")
         except Exception as e:
@@ -329,23 +693,23 @@ class SchedulerPersistence:
         Returns:
             A list of task runs
         """
-        try:
-            conn = sqlite3.connect(self.db_file)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                "SELECT * FROM task_runs WHERE task_id = ? ORDER BY start_time DESC LIMIT ?",
-                (task_id, limit)
-            )
-            
+        # Make runs that are still queued visible
+        self.flush()
+        
+        rows = []
+        with self._txn(False, f"getting task runs for task {task_id}") as (conn, cursor):
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(_SELECT_TASK_RUNS_SQL, (task_id, limit))
             rows = cursor.fetchall()
-            conn.close()
-            
-            return [dict(row) for row in rows]
-        except Exception as e:
-            self.logger.error(f"Error getting task runs for task {task_id}: {str(e)}")
-            return []
+        
+        runs = []
+        for row in rows:
+            run = dict(row)
+            run["start_time"] = _ms_to_iso(run["start_time"])
+            run["end_time"] = _ms_to_iso(run["end_time"])
+            runs.append(run)
+        
+        return runs
     
     def cleanup_old_runs(self, days: int = 30):
         """
@@ -354,21 +718,28 @@ class SchedulerPersistence:
         Args:
             days: Number of days to keep
         """
+        cutoff_ms = int((time.time() - days * 86400) * 1000)
+        
+        deleted_count = 0
+        
+        # Delete runs older than the specified number of days in small
+        # batches, releasing the writer in between so run logging continues
+        while True:
+            batch_count = 0
+            with self._txn(True, "cleaning up old task runs") as (conn, cursor):
+                batch_count = cursor.execute(_DELETE_OLD_RUNS_SQL, (cutoff_ms, _CLEANUP_BATCH_SIZE)).rowcount
+            
+            deleted_count += batch_count
+            if batch_count < _CLEANUP_BATCH_SIZE:
+                break
+        
+        if deleted_count > 0:
+            self.logger.info(f"Cleaned up {deleted_count} old task runs")
+        
+        # Fold the WAL back into the database and truncate it, so it does not
+        # keep the size it grew to under heavy run logging
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # Delete runs older than the specified number of days
-            cursor.execute(
-                "DELETE FROM task_runs WHERE start_time < datetime('now', ?)",
-                (f"-{days} days",)
-            )
-            
-            deleted_count = cursor.rowcount
-            conn.commit()
-            conn.close()
-            
-            if deleted_count > 0:
-                self.logger.info(f"Cleaned up {deleted_count} old task runs")
+            with self._pool.writer() as conn:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
         except Exception as e:
-            self.logger.error(f"Error cleaning up old task runs: {str(e)}")
\ No newline at end of file
+            self.logger.error(f"Error checkpointing database: {str(e)}")
\ No newline at end of file
@@ -6,20 +6,35 @@ This module provides task scheduling capabilities for the agent.
 
 import os
 import logging
+import time
 import asyncio
-from typing import Dict, List, Any, Optional, Set, Union, Callable
-from datetime import datetime, timedelta
+import inspect
+import weakref
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, Callable
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.executors.asyncio import AsyncIOExecutor
+from apscheduler.executors.pool import ThreadPoolExecutor as JobThreadPoolExecutor
 from apscheduler.jobstores.base import JobLookupError
+from apscheduler.events import EVENT_JOB_ADDED, EVENT_JOB_EXECUTED, EVENT_JOB_MODIFIED, EVENT_JOB_SUBMITTED
 
 from utils.logger import get_logger
 from scheduler.persistence import SchedulerPersistence
 from scheduler.triggers import TriggerParser
+from scheduler.view import ScheduleView
+
+# Seconds between flushes of pending schedule changes to persistence
+_PERSIST_INTERVAL = float(os.getenv("SCHEDULER_PERSIST_INTERVAL", "2"))
+
+# Events buffered per listener before new ones are dropped
+_LISTENER_QUEUE_SIZE = 1024
 
 
 class TaskScheduler:
@@ -52,14 +67,37 @@ class TaskScheduler:
         # Configure scheduler
         self._configure_scheduler()
         
-        # Track scheduled jobs by task ID
-        self.scheduled_tasks: Dict[str, str] = {}  # task_id -> job_id
+        # Everything known about each scheduled task, kept in memory so reads
+        # need neither the jobstore nor persistence
+        self.view = ScheduleView(self.trigger_parser, self.persistence)
+        
+        # Schedule changes waiting to be persisted, coalesced per task:
+        # task_id -> ("save", row) or ("delete", None)
+        self._dirty_schedules: Dict[str, Tuple[str, Optional[tuple]]] = {}
+        self._dirty_lock = threading.Lock()
         
-        # Track running tasks
+        # Blocking persistence work runs here, off the event loop
+        self._io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sched-io")
+        
+        # Track running tasks; the lock only guards check-and-insert/removal,
+        # never a task's execution
         self.running_tasks: Set[str] = set()
+        self._running_lock = asyncio.Lock()
+        
+        # Track listeners; on the event loop each one is fed from its own
+        # queue by a consumer task, so a slow listener never blocks scheduling
+        self.listeners: Set[Callable[[Dict[str, Any]], Any]] = set()
+        self._listener_queues: Dict[Callable, asyncio.Queue] = {}
+        self._listener_tasks: Dict[Callable, asyncio.Task] = {}
+        
+        # Listeners dropped automatically once nothing else references them,
+        # e.g. handlers of closed WebSocket sessions
+        self.weak_listeners: weakref.WeakSet = weakref.WeakSet()
+        self._weak_listener_queues: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._weak_listener_tasks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
         
-        # Track listeners
-        self.listeners: List[Callable[[Dict[str, Any]], None]] = []
+        # Listener events of schedules loaded by start(), sent once loading is done
+        self._deferred_events: List[Dict[str, Any]] = []
         
         self.logger.info("Task scheduler initialized")
     
@@ -71,36 +109,82 @@ class TaskScheduler:
         # Set max instances
         max_instances = int(os.getenv("SCHEDULER_MAX_INSTANCES", "3"))
         
-        # Set misc options
+        # Set the thread pool size for blocking jobs
+        executor_workers = int(os.getenv("SCHEDULER_EXECUTOR_WORKERS", "20"))
+        
+        # Set how late a job may still start
+        misfire_grace_time = int(os.getenv("SCHEDULER_MISFIRE_GRACE", "300"))
+        
+        # Set misc options; coroutine jobs run on the event loop, blocking
+        # jobs can be routed to the thread pool with executor="threadpool"
         self.scheduler.configure(
             timezone=timezone,
+            executors={
+                'default': AsyncIOExecutor(),
+                'threadpool': JobThreadPoolExecutor(executor_workers)
+            },
             job_defaults={
                 'coalesce': True,
                 'max_instances': max_instances,
-                'misfire_grace_time': 60
+                'misfire_grace_time': misfire_grace_time
             }
         )
+        
+        # Push next run times into the view as jobs are added, submitted, run
+        # or changed, so reads never have to consult the jobstore
+        self.scheduler.add_listener(
+            self._on_job_event,
+            EVENT_JOB_ADDED | EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_MODIFIED
+        )
+    
+    @property
+    def scheduled_tasks(self) -> Dict[str, str]:
+        """Job IDs of scheduled tasks by task ID."""
+        return self.view.job_ids()
     
     def start(self):
         """Start the scheduler."""
-        # Load persisted schedules
+        # Start the scheduler paused, so loading many schedules does not
+        # recompute the next wakeup after every added job
+        self.scheduler.start(paused=True)
+        
+        # Load persisted schedules, holding back their listener events
         self._load_schedules()
         
-        # Start the scheduler
-        self.scheduler.start()
+        self.scheduler.resume()
+        
+        # Deliver the held back events in one pass
+        deferred_events, self._deferred_events = self._deferred_events, []
+        for event in deferred_events:
+            self._notify_listeners(event)
         
         # Schedule cleanup task
         self._schedule_cleanup()
         
+        # Schedule the persistence flush
+        self._schedule_persist_flush()
+        
         self.logger.info("Task scheduler started")
     
     def shutdown(self):
         """Shutdown the scheduler."""
         # Shutdown the scheduler
         self.scheduler.shutdown()
+        
+        # Write out schedule changes that are still pending
+        self._flush_schedules()
+        
+        # Wait for queued task runs to be written
+        self.persistence.flush()
+        
+        self._io_executor.shutdown(wait=True)
+        
+        # Release cached triggers
+        self.trigger_parser.clear_cache()
+        
         self.logger.info("Task scheduler shutdown")
     
-    def schedule_task(self, task_id: str, schedule_spec: str, start_time: Optional[datetime] = None) -> bool:
+    def schedule_task(self, task_id: str, schedule_spec: str, start_time: Optional[datetime] = None, persist: bool = True, defer_notify: bool = False, now: Optional[datetime] = None) -> bool:
         """
         Schedule a task for execution.
         
@@ -108,6 +192,11 @@ class TaskScheduler:
             task_id: The task ID
             schedule_spec: The schedule specification (cron expression, interval, or date)
             start_time: Optional start time for the schedule
+            persist: Whether to persist the schedule; False when replaying
+                schedules that were just loaded from persistence
+            defer_notify: Hold the listener event until start() delivers the
+                events of all loaded schedules
+            now: The current time, shared when scheduling many tasks at once
             
         Returns:
             True if successful, False otherwise
@@ -118,8 +207,18 @@ class TaskScheduler:
                 self.logger.error(f"Cannot schedule task {task_id}: Task not found")
                 return False
             
+            # Nothing to do if the task already has this exact schedule; relative
+            # specs ("in 5m") are excluded since they mean a new run time each call
+            existing = self.view.get(task_id)
+            if (existing is not None
+                    and existing["schedule_value"] == schedule_spec
+                    and existing.get("start_time") == start_time
+                    and not schedule_spec.startswith("in ")):
+                self.logger.debug(f"Task {task_id} already scheduled with: {schedule_spec}")
+                return True
+            
             # Parse the schedule specification
-            trigger = self.trigger_parser.parse(schedule_spec, start_time)
+            trigger = self.trigger_parser.parse(schedule_spec, start_time, now)
             if trigger is None:
                 self.logger.error(f"Invalid schedule specification: {schedule_spec}")
                 return False
@@ -139,32 +238,45 @@ class TaskScheduler:
                 self._execute_task,
                 trigger=trigger,
                 args=[task_id],
-                id=f"task_{task_id}_{datetime.now().timestamp()}",
+                id=f"task_{task_id}_{time.monotonic_ns()}",
                 replace_existing=True
             )
             
-            # Track the job
-            self.scheduled_tasks[task_id] = job.id
+            # Job IDs are unique per call, so the job being replaced has to be
+            # removed explicitly
+            if existing is not None:
+                try:
+                    self.scheduler.remove_job(existing["job_id"])
+                except JobLookupError:
+                    pass
             
             # Get human-readable description
             human_readable = self.trigger_parser.get_human_readable(schedule_spec)
             
-            # Persist the schedule
-            self.persistence.save_schedule(
-                task_id=task_id,
-                job_id=job.id,
-                schedule_type=schedule_type,
-                schedule_value=schedule_spec,
-                next_run_time=job.next_run_time
-            )
+            # Track the job; jobs added before the scheduler starts have no next run time yet
+            next_run_dt = getattr(job, "next_run_time", None)
+            next_run_time = next_run_dt.isoformat() if next_run_dt else None
+            self.view.put(task_id, {
+                "job_id": job.id,
+                "schedule_type": schedule_type,
+                "schedule_value": schedule_spec,
+                "human_readable": human_readable,
+                "next_run_time": next_run_time,
+                "trigger": trigger,
+                "start_time": start_time
+            })
+            
+            # Queue the schedule for persistence
+            if persist:
+                self._mark_dirty(task_id, "save", (task_id, job.id, schedule_type, schedule_spec, next_run_dt))
             
             # Update task with schedule info
             task = self.agent.tasks[task_id]
             task.schedule = human_readable
-            task.next_run_time = job.next_run_time
+            task.next_run_time = next_run_dt
             
             # Notify listeners
-            self._notify_listeners({
+            event = {
                 "type": "schedule_update",
                 "task_id": task_id,
                 "schedule": {
@@ -172,9 +284,14 @@ class TaskScheduler:
                     "schedule_type": schedule_type,
                     "schedule_value": schedule_spec,
                     "human_readable": human_readable,
-                    "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None
+                    "next_run_time": next_run_time
                 }
-            })
+            }
+            
+            if defer_notify:
+                self._deferred_events.append(event)
+            else:
+                self._notify_listeners(event)
             
             self.logger.info(f"Scheduled task {task_id} with schedule: {schedule_spec}")
             return True
@@ -194,11 +311,12 @@ class TaskScheduler:
             True if successful, False otherwise
         """
         try:
-            if task_id not in self.scheduled_tasks:
+            entry = self.view.get(task_id)
+            if entry is None:
                 self.logger.warning(f"Cannot cancel task {task_id}: Not scheduled")
                 return False
             
-            job_id = self.scheduled_tasks[task_id]
+            job_id = entry["job_id"]
             
             try:
                 self.scheduler.remove_job(job_id)
@@ -206,10 +324,10 @@ class TaskScheduler:
                 self.logger.warning(f"Job {job_id} not found in scheduler")
             
             # Remove from tracking
-            del self.scheduled_tasks[task_id]
+            self.view.pop(task_id)
             
-            # Remove from persistence
-            self.persistence.delete_schedule(task_id)
+            # Queue the removal from persistence
+            self._mark_dirty(task_id, "delete")
             
             # Update task
             if task_id in self.agent.tasks:
@@ -240,40 +358,7 @@ class TaskScheduler:
         Returns:
             The schedule information or None if not scheduled
         """
-        if task_id not in self.scheduled_tasks:
-            return None
-        
-        job_id = self.scheduled_tasks[task_id]
-        
-        try:
-            job = self.scheduler.get_job(job_id)
-            if job is None:
-                return None
-            
-            # Get schedule from persistence
-            schedule = self.persistence.get_schedule(task_id)
-            if not schedule:
-                return None
-            
-            # Extract trigger information
-            trigger_info = self.trigger_parser.get_trigger_info(job.trigger)
-            
-            # Get human-readable description
-            human_readable = self.trigger_parser.get_human_readable(schedule["schedule_value"])
-            
-            return {
-                "task_id": task_id,
-                "job_id": job_id,
-                "schedule_type": schedule["schedule_type"],
-                "schedule_value": schedule["schedule_value"],
-                "human_readable": human_readable,
-                "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
-                "trigger": trigger_info
-            }
-        
-        except Exception as e:
-            self.logger.error(f"Error getting schedule for task {task_id}: {str(e)}")
-            return None
+        return self.view.get_task_schedule(task_id)
     
     def get_all_schedules(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -282,14 +367,7 @@ class TaskScheduler:
         Returns:
             A dictionary of task schedules
         """
-        schedules = {}
-        
-        for task_id, job_id in self.scheduled_tasks.items():
-            schedule = self.get_task_schedule(task_id)
-            if schedule:
-                schedules[task_id] = schedule
-        
-        return schedules
+        return self.view.get_all_schedules()
     
     def get_task_runs(self, task_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -302,26 +380,40 @@ class TaskScheduler:
         Returns:
             A list of task runs
         """
-        return self.persistence.get_task_runs(task_id, limit)
+        return self.view.get_task_runs(task_id, limit)
     
-    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+    def add_listener(self, listener: Callable[[Dict[str, Any]], Any], weak: bool = False):
         """
         Add a listener for task events.
         
         Args:
-            listener: The listener function
+            listener: The listener function or coroutine function
+            weak: Hold only a weak reference, so the listener goes away with
+                its owner; not suitable for bound methods, which are created
+                afresh on every attribute access
         """
-        self.listeners.append(listener)
+        if weak:
+            self.weak_listeners.add(listener)
+        else:
+            self.listeners.add(listener)
     
-    def remove_listener(self, listener: Callable[[Dict[str, Any]], None]):
+    def remove_listener(self, listener: Callable[[Dict[str, Any]], Any]):
         """
         Remove a listener.
         
         Args:
             listener: The listener function
         """
-        if listener in self.listeners:
-            self.listeners.remove(listener)
+        self.listeners.discard(listener)
+        self.weak_listeners.discard(listener)
+        
+        # Stop its consumer task
+        for queues, tasks in ((self._listener_queues, self._listener_tasks),
+                              (self._weak_listener_queues, self._weak_listener_tasks)):
+            queues.pop(listener, None)
+            task = tasks.pop(listener, None)
+            if task is not None:
+                task.cancel()
     
     async def _execute_task(self, task_id: str):
         """
@@ -336,14 +428,16 @@ class TaskScheduler:
                 self.logger.error(f"Cannot execute task {task_id}: Task not found")
                 return
             
-            # Check if the task is already running
-            if task_id in self.running_tasks:
-                self.logger.warning(f"Task {task_id} is already running, skipping execution")
-                return
+            # Check if the task is already running, and mark it as running
+            async with self._running_lock:
+                if task_id in self.running_tasks:
+                    self.logger.warning(f"Task {task_id} is already running, skipping execution")
+                    return
+                
+                self.running_tasks.add(task_id)
             
-            # Mark as running
-            self.running_tasks.add(task_id)
             start_time = datetime.now()
+            start_iso = start_time.isoformat()
             
             # Log task run start
             self.persistence.log_task_run(
@@ -356,7 +450,7 @@ class TaskScheduler:
             self._notify_listeners({
                 "type": "task_started",
                 "task_id": task_id,
-                "start_time": start_time.isoformat()
+                "start_time": start_iso
             })
             
             # Get the task
@@ -367,7 +461,7 @@ class TaskScheduler:
             task.progress = 0
             task.result = None
             task.error = None
-            task.updated_at = datetime.now()
+            task.updated_at = start_time
             
             # Execute the task
             await self.agent._execute_task(task, "scheduler")
@@ -387,13 +481,14 @@ class TaskScheduler:
                 "type": "task_finished",
                 "task_id": task_id,
                 "status": task.status,
-                "start_time": start_time.isoformat(),
+                "start_time": start_iso,
                 "end_time": end_time.isoformat(),
                 "error": task.error
             })
             
             # Mark as not running
-            self.running_tasks.remove(task_id)
+            async with self._running_lock:
+                self.running_tasks.discard(task_id)
         
         except Exception as e:
             self.logger.error(f"Error executing scheduled task {task_id}: {str(e)}")
@@ -417,13 +512,18 @@ class TaskScheduler:
             })
             
             # Mark as not running
-            if task_id in self.running_tasks:
-                self.running_tasks.remove(task_id)
+            async with self._running_lock:
+                self.running_tasks.discard(task_id)
     
     def _load_schedules(self):
         """Load schedules from persistence."""
         try:
-            schedules = self.persistence.get_all_schedules()
+            # One timestamp for the whole load
+            now = datetime.now(self.trigger_parser.tz)
+            
+            # Past date schedules are filtered out by persistence, which
+            # compares in UTC
+            schedules = self.persistence.get_all_active_schedules(now.astimezone(timezone.utc).replace(tzinfo=None))
             
             loaded_count = 0
             
@@ -435,22 +535,10 @@ class TaskScheduler:
                     self.logger.warning(f"Cannot load schedule for task {task_id}: Task not found")
                     continue
                 
-                schedule_type = schedule["schedule_type"]
                 schedule_value = schedule["schedule_value"]
                 
-                # Skip schedules that are in the past
-                if schedule_type == "date":
-                    try:
-                        date_str = schedule_value.split(":", 1)[1].strip()
-                        run_date = datetime.fromisoformat(date_str)
-                        if run_date <= datetime.now():
-                            self.logger.warning(f"Skipping past date schedule for task {task_id}")
-                            continue
-                    except:
-                        pass
-                
-                # Schedule the task
-                success = self.schedule_task(task_id, schedule_value)
+                # Schedule the task; the schedule is already persisted
+                success = self.schedule_task(task_id, schedule_value, persist=False, defer_notify=True, now=now)
                 if success:
                     loaded_count += 1
             
@@ -466,12 +554,152 @@ class TaskScheduler:
         Args:
             event: The event data
         """
-        for listener in self.listeners:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop in this thread; call the listeners directly
+            for listener in (*self.listeners, *self.weak_listeners):
+                try:
+                    result = listener(event)
+                    if inspect.iscoroutine(result):
+                        result.close()
+                        self.logger.warning("Skipped async listener called outside the event loop")
+                except Exception as e:
+                    self.logger.error(f"Error in listener: {str(e)}")
+            return
+        
+        for listeners, queues, tasks in ((self.listeners, self._listener_queues, self._listener_tasks),
+                                         (self.weak_listeners, self._weak_listener_queues, self._weak_listener_tasks)):
+            weak = listeners is self.weak_listeners
+            
+            for listener in list(listeners):
+                queue = queues.get(listener)
+                if queue is None:
+                    queue = asyncio.Queue(maxsize=_LISTENER_QUEUE_SIZE)
+                    queues[listener] = queue
+                    
+                    # The consumer of a weak listener must not keep it alive,
+                    # and is cancelled once the listener is collected
+                    listener_ref = weakref.ref(listener) if weak else (lambda listener=listener: listener)
+                    task = asyncio.create_task(self._listener_loop(listener_ref, queue))
+                    tasks[listener] = task
+                    if weak:
+                        weakref.finalize(listener, task.cancel)
+                
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    self.logger.warning(f"Listener queue full, dropping {event.get('type')} event")
+    
+    async def _listener_loop(self, listener_ref: Callable[[], Optional[Callable[[Dict[str, Any]], Any]]], queue: asyncio.Queue):
+        """
+        Deliver queued events to a listener.
+        
+        Args:
+            listener_ref: Returns the listener, or None once it is gone
+            queue: The listener's event queue
+        """
+        while True:
+            event = await queue.get()
+            
+            listener = listener_ref()
+            if listener is None:
+                return
+            
             try:
-                listener(event)
+                result = listener(event)
+                listener = None
+                if inspect.isawaitable(result):
+                    await result
             except Exception as e:
                 self.logger.error(f"Error in listener: {str(e)}")
     
+    def _on_job_event(self, event):
+        """
+        Refresh a task's cached next run time after its job runs or changes.
+        
+        Args:
+            event: The APScheduler job event
+        """
+        task_id = self.view.find_task(event.job_id)
+        if task_id is None:
+            return
+        
+        job = self.scheduler.get_job(event.job_id)
+        if job is None:
+            # One-off jobs are removed once they have run
+            self.view.pop(task_id)
+            return
+        
+        self.view.set_next_run_time(task_id, job.next_run_time.isoformat() if job.next_run_time else None)
+    
+    def _mark_dirty(self, task_id: str, action: str, row: Optional[tuple] = None):
+        """
+        Queue a schedule change for the next persistence flush.
+        
+        The flush job only runs while APScheduler is running, so when it
+        isn't (web-only mode, worker apps, after shutdown) the change is
+        written through immediately.
+        
+        Args:
+            task_id: The task ID
+            action: "save" or "delete"
+            row: The schedule row to save
+        """
+        with self._dirty_lock:
+            self._dirty_schedules[task_id] = (action, row)
+        
+        if not self.scheduler.running:
+            try:
+                self._flush_schedules()
+            except Exception as e:
+                self.logger.error(f"Error persisting schedule for task {task_id}: {str(e)}")
+    
+    def _flush_schedules(self):
+        """Write pending schedule changes to persistence in bulk."""
+        with self._dirty_lock:
+            if not self._dirty_schedules:
+                return
+            
+            dirty, self._dirty_schedules = self._dirty_schedules, {}
+        
+        rows = []
+        deleted = []
+        for task_id, (action, row) in dirty.items():
+            if action == "save":
+                rows.append(row)
+            else:
+                deleted.append(task_id)
+        
+        try:
+            self.persistence.bulk_delete_schedules(deleted)
+            self.persistence.bulk_save_schedules(rows)
+        except Exception:
+            # Requeue the changes for the next flush, unless newer ones
+            # were made in the meantime
+            with self._dirty_lock:
+                for task_id, change in dirty.items():
+                    self._dirty_schedules.setdefault(task_id, change)
+            raise
+        
+        self.logger.debug(f"Persisted {len(rows)} schedules and {len(deleted)} removals")
+    
+    def _schedule_persist_flush(self):
+        """Schedule the periodic flush of pending schedule changes."""
+        self.scheduler.add_job(
+            self._persist_flush_task,
+            trigger=IntervalTrigger(seconds=_PERSIST_INTERVAL),
+            id="persist_flush_task",
+            replace_existing=True
+        )
+    
+    async def _persist_flush_task(self):
+        """Flush pending schedule changes."""
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._io_executor, self._flush_schedules)
+        except Exception as e:
+            self.logger.error(f"Error in persistence flush task: {str(e)}")
+    
     def _schedule_cleanup(self):
         """Schedule the cleanup task."""
         # Run cleanup once a day
@@ -489,7 +717,9 @@ class TaskScheduler:
             retention_days = int(os.getenv("SCHEDULER_RETENTION_DAYS", "30"))
             
             # Cleanup old task runs
-            self.persistence.cleanup_old_runs(retention_days)
+            await asyncio.get_running_loop().run_in_executor(
+                self._io_executor, self.persistence.cleanup_old_runs, retention_days
+            )
             
             self.logger.info(f"Cleaned up old task runs (retention: {retention_days} days)")
         except Exception as e:
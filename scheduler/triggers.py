@@ -7,8 +7,10 @@ This module provides trigger definitions for the task scheduler.
 import os
 import logging
 import re
+from functools import lru_cache
 from typing import Dict, Any, Optional, Union
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone, tzinfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
@@ -16,6 +18,105 @@ from apscheduler.triggers.interval import IntervalTrigger
 
 from utils.logger import get_logger
 
+# Duration shared by interval and relative specs: {number}{unit}
+_INTERVAL_RE = re.compile(r'^(\d+)([smhd])$')
+
+# Duration unit -> trigger/timedelta keyword
+_UNIT_TO_KW = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days'}
+
+# Duration unit -> (singular, plural) label
+_UNIT_LABELS = {
+    's': ('second', 'seconds'),
+    'm': ('minute', 'minutes'),
+    'h': ('hour', 'hours'),
+    'd': ('day', 'days')
+}
+
+# Cron field patterns
+_FIELD_MIN = r'(?:\*|(?:[0-5]?\d)(?:-(?:[0-5]?\d))?(?:,(?:[0-5]?\d)(?:-(?:[0-5]?\d))?)*|\*/\d+)'
+_FIELD_HR = r'(?:\*|(?:1?\d|2[0-3])(?:-(?:1?\d|2[0-3]))?(?:,(?:1?\d|2[0-3])(?:-(?:1?\d|2[0-3]))?)*|\*/\d+)'
+_FIELD_DOM = r'(?:\*|(?:[1-9]|[12]\d|3[01])(?:-(?:[1-9]|[12]\d|3[01]))?(?:,(?:[1-9]|[12]\d|3[01])(?:-(?:[1-9]|[12]\d|3[01]))?)*|\*/\d+)'
+_FIELD_MON = r'(?:\*|(?:[1-9]|1[0-2])(?:-(?:[1-9]|1[0-2]))?(?:,(?:[1-9]|1[0-2])(?:-(?:[1-9]|1[0-2]))?)*|\*/\d+)'
+_FIELD_DOW = r'(?:\*|[0-6](?:-[0-6])?(?:,[0-6](?:-[0-6])?)*|\*/\d+)'
+
+# A whole five-field cron expression, matched in one pass
+_CRON_FULL_RE = re.compile(r'\s+'.join((_FIELD_MIN, _FIELD_HR, _FIELD_DOM, _FIELD_MON, _FIELD_DOW)))
+
+
+def _format_duration(schedule_spec: str, duration: str, prefix: str) -> str:
+    """
+    Describe a {number}{unit} duration, e.g. "Every 5 minutes".
+    
+    Args:
+        schedule_spec: The full schedule specification, returned if the duration is invalid
+        duration: The duration part of the specification
+        prefix: The leading word of the description
+        
+    Returns:
+        A human-readable description
+    """
+    match = _INTERVAL_RE.match(duration)
+    if not match:
+        return schedule_spec
+    
+    value = int(match.group(1))
+    label = _UNIT_LABELS[match.group(2)][0 if value == 1 else 1]
+    
+    return f"{prefix} {value} {label}"
+
+
+@lru_cache(maxsize=256)
+def _cron_trigger(cron_expr: str) -> CronTrigger:
+    """
+    Build a CronTrigger for a cron expression.
+    
+    Cron triggers are immutable and hold no start time, so one instance can be
+    shared by every job with the same expression. Interval and date triggers
+    are bound to when they were created and are never cached.
+    
+    Args:
+        cron_expr: The cron expression
+        
+    Returns:
+        A CronTrigger object
+    """
+    return CronTrigger.from_crontab(cron_expr)
+
+
+@lru_cache(maxsize=1024)
+def _human_readable(schedule_spec: str) -> str:
+    """
+    Build a human-readable description of a schedule specification.
+    
+    The description depends only on the spec, so results are cached.
+    
+    Args:
+        schedule_spec: The schedule specification
+        
+    Returns:
+        A human-readable description
+    """
+    if schedule_spec.startswith("cron:"):
+        cron_expr = schedule_spec[5:].strip()
+        return f"Cron schedule: {cron_expr}"
+    
+    elif schedule_spec.startswith("every "):
+        return _format_duration(schedule_spec, schedule_spec[6:].strip(), "Every")
+    
+    elif schedule_spec.startswith("at:"):
+        date_str = schedule_spec[3:].strip()
+        try:
+            run_date = datetime.fromisoformat(date_str)
+            return f"At {run_date.strftime('%Y-%m-%d %H:%M:%S')}"
+        except:
+            return f"At {date_str}"
+    
+    elif schedule_spec.startswith("in "):
+        return _format_duration(schedule_spec, schedule_spec[3:].strip(), "In")
+    
+    else:
+        return schedule_spec
+
 
 class TriggerParser:
     """Parses schedule specifications into APScheduler triggers."""
@@ -23,49 +124,60 @@ class TriggerParser:
     def __init__(self):
         """Initialize the trigger parser."""
         self.logger = get_logger(__name__)
+        
+        # The scheduler's timezone, so computed run dates need no later conversion
+        try:
+            self._tz = ZoneInfo(os.getenv("SCHEDULER_TIMEZONE", "UTC"))
+        except (ZoneInfoNotFoundError, ValueError):
+            self.logger.warning("Unknown SCHEDULER_TIMEZONE, using UTC")
+            self._tz = timezone.utc
+        
+        # Schedule spec prefix -> parser
+        self._dispatch = {
+            "cron:": self._parse_cron,     # e.g. "cron:0 9 * * 1-5"
+            "every ": self._parse_interval,  # e.g. "every 1h", "every 30m", "every 1d"
+            "at:": self._parse_date,       # ISO date, e.g. "at:2024-01-01T09:00:00"
+            "in ": self._parse_relative,   # e.g. "in 1h", "in 30m", "in 1d"
+        }
     
-    def parse(self, schedule_spec: str, start_time: Optional[datetime] = None) -> Optional[Union[CronTrigger, IntervalTrigger, DateTrigger]]:
+    @property
+    def tz(self) -> tzinfo:
+        """The scheduler's timezone, used for the current time when parsing."""
+        return self._tz
+    
+    def parse(self, schedule_spec: str, start_time: Optional[datetime] = None, now: Optional[datetime] = None) -> Optional[Union[CronTrigger, IntervalTrigger, DateTrigger]]:
         """
         Parse a schedule specification into a trigger.
         
         Args:
             schedule_spec: The schedule specification
             start_time: Optional start time
+            now: The current time, so a batch of parses can share one;
+                defaults to now in the scheduler's timezone
             
         Returns:
             A trigger object or None if invalid
         """
         try:
-            # Check for cron schedule (starts with "cron:")
-            if schedule_spec.startswith("cron:"):
-                return self._parse_cron(schedule_spec)
-            
-            # Check for interval schedule (e.g., "every 1h", "every 30m", "every 1d")
-            elif schedule_spec.startswith("every "):
-                return self._parse_interval(schedule_spec, start_time)
-            
-            # Check for date schedule (ISO format)
-            elif schedule_spec.startswith("at:"):
-                return self._parse_date(schedule_spec)
-            
-            # Check for relative date (e.g., "in 1h", "in 30m", "in 1d")
-            elif schedule_spec.startswith("in "):
-                return self._parse_relative(schedule_spec)
+            for prefix, parser in self._dispatch.items():
+                if schedule_spec.startswith(prefix):
+                    return parser(schedule_spec, start_time, now)
             
-            else:
-                self.logger.error(f"Unknown schedule format: {schedule_spec}")
-                return None
+            self.logger.error(f"Unknown schedule format: {schedule_spec}")
+            return None
         
         except Exception as e:
             self.logger.error(f"Error parsing schedule {schedule_spec}: {str(e)}")
             return None
     
-    def _parse_cron(self, schedule_spec: str) -> Optional[CronTrigger]:
+    def _parse_cron(self, schedule_spec: str, start_time: Optional[datetime] = None, now: Optional[datetime] = None) -> Optional[CronTrigger]:
         """
         Parse a cron schedule specification.
         
         Args:
             schedule_spec: The cron schedule specification
+            start_time: Unused; accepted so all parsers share a signature
+            now: Unused
             
         Returns:
             A CronTrigger object or None if invalid
@@ -78,7 +190,7 @@ class TriggerParser:
             return None
         
         try:
-            return CronTrigger.from_crontab(cron_expr)
+            return _cron_trigger(cron_expr)
         except Exception as e:
             self.logger.error(f"Error creating CronTrigger: {str(e)}")
             return None
@@ -93,75 +205,61 @@ class TriggerParser:
         Returns:
             True if valid, False otherwise
         """
-        # Basic validation
-        parts = cron_expr.split()
-        if len(parts) != 5:
-            return False
+        return _CRON_FULL_RE.fullmatch(cron_expr) is not None
+    
+    def _parse_duration(self, duration_spec: str, kind: str) -> Optional[timedelta]:
+        """
+        Parse a {number}{unit} duration such as "30m".
         
-        # Validate each field
-        patterns = [
-            r'^(\*|(?:[0-5]?\d)(?:-(?:[0-5]?\d))?(?:,(?:[0-5]?\d)(?:-(?:[0-5]?\d))?)*|\*/\d+)$',  # minute
-            r'^(\*|(?:1?\d|2[0-3])(?:-(?:1?\d|2[0-3]))?(?:,(?:1?\d|2[0-3])(?:-(?:1?\d|2[0-3]))?)*|\*/\d+)$',  # hour
-            r'^(\*|(?:[1-9]|[12]\d|3[01])(?:-(?:[1-9]|[12]\d|3[01]))?(?:,(?:[1-9]|[12]\d|3[01])(?:-(?:[1-9]|[12]\d|3[01]))?)*|\*/\d+)$',  # day of month
-            r'^(\*|(?:[1-9]|1[0-2])(?:-(?:[1-9]|1[0-2]))?(?:,(?:[1-9]|1[0-2])(?:-(?:[1-9]|1[0-2]))?)*|\*/\d+)$',  # month
-            r'^(\*|[0-6](?:-[0-6])?(?:,[0-6](?:-[0-6])?)*|\*/\d+)$'  # day of week
-        ]
+        Args:
+            duration_spec: The duration specification
+            kind: "Interval" or "Relative", for error messages
+            
+        Returns:
+            The duration or None if invalid
+        """
+        match = _INTERVAL_RE.match(duration_spec)
+        if not match:
+            self.logger.error(f"Invalid {kind.lower()} specification: {duration_spec}")
+            return None
         
-        for i, pattern in enumerate(patterns):
-            if not re.match(pattern, parts[i]):
-                return False
+        value = int(match.group(1))
+        if value <= 0:
+            self.logger.error(f"{kind} value must be positive: {value}")
+            return None
         
-        return True
+        return timedelta(**{_UNIT_TO_KW[match.group(2)]: value})
     
-    def _parse_interval(self, schedule_spec: str, start_time: Optional[datetime] = None) -> Optional[IntervalTrigger]:
+    def _parse_interval(self, schedule_spec: str, start_time: Optional[datetime] = None, now: Optional[datetime] = None) -> Optional[IntervalTrigger]:
         """
         Parse an interval schedule specification.
         
         Args:
             schedule_spec: The interval schedule specification
             start_time: Optional start time
+            now: Unused; accepted so all parsers share a signature
             
         Returns:
             An IntervalTrigger object or None if invalid
         """
-        interval_spec = schedule_spec[6:].strip()
-        
-        # Match the pattern: {number}{unit}
-        match = re.match(r'^(\d+)([smhd])$', interval_spec)
-        if not match:
-            self.logger.error(f"Invalid interval specification: {interval_spec}")
-            return None
-        
-        value = int(match.group(1))
-        unit = match.group(2)
-        
-        if value <= 0:
-            self.logger.error(f"Interval value must be positive: {value}")
+        interval = self._parse_duration(schedule_spec[6:].strip(), "Interval")
+        if interval is None:
             return None
         
         try:
-            kwargs = {"start_date": start_time}
-            
-            if unit == 's':
-                kwargs["seconds"] = value
-            elif unit == 'm':
-                kwargs["minutes"] = value
-            elif unit == 'h':
-                kwargs["hours"] = value
-            elif unit == 'd':
-                kwargs["days"] = value
-            
-            return IntervalTrigger(**kwargs)
+            return IntervalTrigger(seconds=int(interval.total_seconds()), start_date=start_time)
         except Exception as e:
             self.logger.error(f"Error creating IntervalTrigger: {str(e)}")
             return None
     
-    def _parse_date(self, schedule_spec: str) -> Optional[DateTrigger]:
+    def _parse_date(self, schedule_spec: str, start_time: Optional[datetime] = None, now: Optional[datetime] = None) -> Optional[DateTrigger]:
         """
         Parse a date schedule specification.
         
         Args:
             schedule_spec: The date schedule specification
+            start_time: Unused; accepted so all parsers share a signature
+            now: The current time
             
         Returns:
             A DateTrigger object or None if invalid
@@ -171,8 +269,8 @@ class TriggerParser:
         try:
             run_date = datetime.fromisoformat(date_str)
             
-            # Ensure the date is in the future
-            if run_date <= datetime.now():
+            # Ensure the date is in the future; naive dates are local time
+            if run_date.astimezone() <= (now or datetime.now(self._tz)):
                 self.logger.warning(f"Date is in the past: {date_str}")
             
             return DateTrigger(run_date=run_date)
@@ -180,50 +278,35 @@ class TriggerParser:
             self.logger.error(f"Error parsing date {date_str}: {str(e)}")
             return None
     
-    def _parse_relative(self, schedule_spec: str) -> Optional[DateTrigger]:
+    def _parse_relative(self, schedule_spec: str, start_time: Optional[datetime] = None, now: Optional[datetime] = None) -> Optional[DateTrigger]:
         """
         Parse a relative date schedule specification.
         
         Args:
             schedule_spec: The relative date schedule specification
+            start_time: Unused; accepted so all parsers share a signature
+            now: The time the delay counts from
             
         Returns:
             A DateTrigger object or None if invalid
         """
-        relative_spec = schedule_spec[3:].strip()
-        
-        # Match the pattern: {number}{unit}
-        match = re.match(r'^(\d+)([smhd])$', relative_spec)
-        if not match:
-            self.logger.error(f"Invalid relative specification: {relative_spec}")
-            return None
-        
-        value = int(match.group(1))
-        unit = match.group(2)
-        
-        if value <= 0:
-            self.logger.error(f"Relative value must be positive: {value}")
+        delay = self._parse_duration(schedule_spec[3:].strip(), "Relative")
+        if delay is None:
             return None
         
         try:
-            now = datetime.now()
-            
-            if unit == 's':
-                run_date = now + timedelta(seconds=value)
-            elif unit == 'm':
-                run_date = now + timedelta(minutes=value)
-            elif unit == 'h':
-                run_date = now + timedelta(hours=value)
-            elif unit == 'd':
-                run_date = now + timedelta(days=value)
-            else:
-                return None
+            run_date = (now or datetime.now(self._tz)) + delay
             
             return DateTrigger(run_date=run_date)
         except Exception as e:
             self.logger.error(f"Error creating DateTrigger: {str(e)}")
             return None
     
+    def clear_cache(self):
+        """Clear the cached cron triggers and schedule descriptions."""
+        _cron_trigger.cache_clear()
+        _human_readable.cache_clear()
+    
     def get_trigger_info(self, trigger: Union[CronTrigger, IntervalTrigger, DateTrigger]) -> Dict[str, Any]:
         """
         Get information about a trigger.
@@ -260,61 +343,7 @@ class TriggerParser:
             A human-readable description
         """
         try:
-            if schedule_spec.startswith("cron:"):
-                cron_expr = schedule_spec[5:].strip()
-                return f"Cron schedule: {cron_expr}"
-            
-            elif schedule_spec.startswith("every "):
-                interval_spec = schedule_spec[6:].strip()
-                
-                # Match the pattern: {number}{unit}
-                match = re.match(r'^(\d+)([smhd])$', interval_spec)
-                if not match:
-                    return schedule_spec
-                
-                value = int(match.group(1))
-                unit = match.group(2)
-                
-                unit_names = {
-                    's': 'second' if value == 1 else 'seconds',
-                    'm': 'minute' if value == 1 else 'minutes',
-                    'h': 'hour' if value == 1 else 'hours',
-                    'd': 'day' if value == 1 else 'days'
-                }
-                
-                return f"Every {value} {unit_names[unit]}"
-            
-            elif schedule_spec.startswith("at:"):
-                date_str = schedule_spec[3:].strip()
-                try:
-                    run_date = datetime.fromisoformat(date_str)
-                    return f"At {run_date.strftime('%Y-%m-%d %H:%M:%S')}"
-                except:
-                    return f"At {date_str}"
-            
-            elif schedule_spec.startswith("in "):
-                relative_spec = schedule_spec[3:].strip()
-                
-                # Match the pattern: {number}{unit}
-                match = re.match(r'^(\d+)([smhd])$', relative_spec)
-                if not match:
-                    return schedule_spec
-                
-                value = int(match.group(1))
-                unit = match.group(2)
-                
-                unit_names = {
-                    's': 'second' if value == 1 else 'seconds',
-                    'm': 'minute' if value == 1 else 'minutes',
-                    'h': 'hour' if value == 1 else 'hours',
-                    'd': 'day' if value == 1 else 'days'
-                }
-                
-                return f"In {value} {unit_names[unit]}"
-            
-            else:
-                return schedule_spec
-        
+            return _human_readable(schedule_spec)
         except Exception as e:
             self.logger.error(f"Error getting human-readable description: {str(e)}")
             return schedule_spec
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+Task Scheduler View Module
+------------------------
+This module provides the read side of the task scheduler: an in-memory view
+of scheduled tasks that answers schedule queries without touching the
+APScheduler jobstore.
+"""
+
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from utils.logger import get_logger
+
+# Seconds a cached trigger description stays valid
+_TRIGGER_INFO_TTL = 60.0
+
+
+class ScheduleView:
+    """
+    In-memory view of scheduled tasks.
+    
+    The scheduler updates the view when it schedules or cancels tasks and
+    when APScheduler reports job changes; everything else only reads it.
+    Updates replace whole entries, so reads are safe from any thread.
+    """
+    
+    def __init__(self, trigger_parser, persistence):
+        """
+        Initialize the schedule view.
+        
+        Args:
+            trigger_parser: The trigger parser used to describe triggers
+            persistence: The scheduler persistence, for task run history
+        """
+        self.logger = get_logger(__name__)
+        self.trigger_parser = trigger_parser
+        self.persistence = persistence
+        
+        # task_id -> {job_id, schedule_type, schedule_value, human_readable,
+        # next_run_time, trigger}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        
+        # Reverse index for job events: job_id -> task_id
+        self._job_to_task: Dict[str, str] = {}
+        
+        # Trigger descriptions by job ID: job_id -> (cached_at, info)
+        self._trigger_info_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._trigger_info_purged_at = time.monotonic()
+    
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the raw entry for a task.
+        
+        Args:
+            task_id: The task ID
+        
+        Returns:
+            The entry or None if not scheduled
+        """
+        return self._entries.get(task_id)
+    
+    def job_ids(self) -> Dict[str, str]:
+        """
+        Get the job IDs of scheduled tasks.
+        
+        Returns:
+            A dictionary mapping task IDs to job IDs
+        """
+        return {task_id: entry["job_id"] for task_id, entry in list(self._entries.items())}
+    
+    def put(self, task_id: str, entry: Dict[str, Any]):
+        """
+        Set the entry for a task, replacing any previous one.
+        
+        Args:
+            task_id: The task ID
+            entry: The schedule entry
+        """
+        previous = self._entries.get(task_id)
+        if previous is not None:
+            self._job_to_task.pop(previous["job_id"], None)
+            self._trigger_info_cache.pop(previous["job_id"], None)
+        
+        self._entries[task_id] = entry
+        self._job_to_task[entry["job_id"]] = task_id
+    
+    def pop(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Remove the entry for a task.
+        
+        Args:
+            task_id: The task ID
+        
+        Returns:
+            The removed entry or None if not scheduled
+        """
+        entry = self._entries.pop(task_id, None)
+        if entry is not None:
+            self._job_to_task.pop(entry["job_id"], None)
+            self._trigger_info_cache.pop(entry["job_id"], None)
+        
+        return entry
+    
+    def find_task(self, job_id: str) -> Optional[str]:
+        """
+        Find the task a job belongs to.
+        
+        Args:
+            job_id: The job ID
+        
+        Returns:
+            The task ID or None if the job is not a task schedule
+        """
+        return self._job_to_task.get(job_id)
+    
+    def set_next_run_time(self, task_id: str, next_run_time: Optional[str]):
+        """
+        Update the next run time of a task.
+        
+        Args:
+            task_id: The task ID
+            next_run_time: The next run time as an ISO string
+        """
+        entry = self._entries.get(task_id)
+        if entry is not None:
+            self._entries[task_id] = {**entry, "next_run_time": next_run_time}
+    
+    def get_task_schedule(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the schedule for a task.
+        
+        Args:
+            task_id: The task ID
+        
+        Returns:
+            The schedule information or None if not scheduled
+        """
+        entry = self._entries.get(task_id)
+        if entry is None:
+            return None
+        
+        try:
+            # Extract trigger information
+            trigger_info = self._get_trigger_info(entry["job_id"], entry["trigger"])
+            
+            return {
+                "task_id": task_id,
+                "job_id": entry["job_id"],
+                "schedule_type": entry["schedule_type"],
+                "schedule_value": entry["schedule_value"],
+                "human_readable": entry["human_readable"],
+                "next_run_time": entry["next_run_time"],
+                "trigger": trigger_info
+            }
+        
+        except Exception as e:
+            self.logger.error(f"Error getting schedule for task {task_id}: {str(e)}")
+            return None
+    
+    def get_all_schedules(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get all scheduled tasks.
+        
+        Returns:
+            A dictionary of task schedules
+        """
+        schedules = {}
+        
+        for task_id in list(self._entries):
+            schedule = self.get_task_schedule(task_id)
+            if schedule:
+                schedules[task_id] = schedule
+        
+        return schedules
+    
+    def get_task_runs(self, task_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the execution history for a task.
+        
+        Args:
+            task_id: The task ID
+            limit: Maximum number of runs to return
+        
+        Returns:
+            A list of task runs
+        """
+        return self.persistence.get_task_runs(task_id, limit)
+    
+    def _get_trigger_info(self, job_id: str, trigger) -> Dict[str, Any]:
+        """
+        Get the trigger description for a job, cached for _TRIGGER_INFO_TTL seconds.
+        
+        Args:
+            job_id: The job ID
+            trigger: The job's trigger
+        
+        Returns:
+            A dictionary with trigger information
+        """
+        now = time.monotonic()
+        
+        # Drop expired entries, such as those of finished one-off jobs
+        if now - self._trigger_info_purged_at > _TRIGGER_INFO_TTL:
+            self._trigger_info_cache = {
+                cached_job_id: entry for cached_job_id, entry in list(self._trigger_info_cache.items())
+                if now - entry[0] <= _TRIGGER_INFO_TTL
+            }
+            self._trigger_info_purged_at = now
+        
+        entry = self._trigger_info_cache.get(job_id)
+        if entry is not None and now - entry[0] <= _TRIGGER_INFO_TTL:
+            return entry[1]
+        
+        trigger_info = self.trigger_parser.get_trigger_info(trigger)
+        self._trigger_info_cache[job_id] = (now, trigger_info)
+        
+        return trigger_info
@@ -7,7 +7,11 @@ This script downloads the necessary LLM model files for the Local Scout AI Agent
 
 import os
 import sys
+import time
+import asyncio
+import hashlib
 import argparse
+import importlib.util
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
@@ -21,6 +25,13 @@ from utils.logger import setup_logging
 # Load environment variables
 load_dotenv()
 
+# Buffer size for copying model files across filesystems
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Backoff in seconds between retries of rate-limited (HTTP 429) Hub requests
+_RETRY_MIN_DELAY = 1
+_RETRY_MAX_DELAY = 32
+
 
 def parse_args():
     """Parse command line arguments."""
@@ -52,23 +63,136 @@ def parse_args():
     return parser.parse_args()
 
 
-def download_model(model_name, save_path, force=False):
-    """Download the specified model."""
+def _configure_hf_hub():
+    """Configure huggingface_hub before any download; must run before it is first imported."""
     logger = logging.getLogger(__name__)
     
-    # Ensure the models directory exists
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    # Use the hf_transfer backend, which pulls ranged chunks over several
+    # connections; huggingface_hub reads the flag when it is first imported
+    if importlib.util.find_spec("hf_transfer") is not None:
+        os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+    else:
+        logger.warning("hf_transfer is not installed, downloading over a single connection (pip install hf_transfer)")
     
-    # Check if model already exists
-    if os.path.exists(save_path) and not force:
-        logger.info(f"Model {model_name} already exists at {save_path}")
-        return True
+    try:
+        import requests
+        from huggingface_hub import configure_http_backend
+        
+        # huggingface_hub calls the factory once per thread and reuses the
+        # session for all of that thread's requests, so connections are kept
+        # alive across files; requests.Session isn't thread-safe, so each
+        # thread gets its own
+        def backend_factory():
+            session = requests.Session()
+            session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=16))
+            return session
+        
+        configure_http_backend(backend_factory=backend_factory)
+    
+    except Exception as e:
+        logger.warning("Could not configure the Hugging Face HTTP backend: %s", e)
+
+
+def _with_backoff(func, *args, **kwargs):
+    """Call a Hugging Face Hub function, retrying with exponential backoff while it is rate-limited."""
+    logger = logging.getLogger(__name__)
     
-    logger.info(f"Downloading {model_name} to {save_path}...")
+    from huggingface_hub.utils import HfHubHTTPError
+    
+    delay = _RETRY_MIN_DELAY
+    while True:
+        try:
+            return func(*args, **kwargs)
+        
+        except HfHubHTTPError as e:
+            status_code = e.response.status_code if e.response is not None else None
+            if status_code != 429 or delay > _RETRY_MAX_DELAY:
+                raise
+            
+            logger.warning("Rate limited by the Hugging Face Hub, retrying in %s seconds", delay)
+            time.sleep(delay)
+            delay *= 2
+
+
+def _fast_copy(src, dst):
+    """Copy a file, using copy_file_range where available and 1 MiB buffered reads otherwise."""
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        
+        # Reserve the whole file up front so it is laid out contiguously;
+        # some filesystems, such as tmpfs and NFS, don't support it
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fdst.fileno(), 0, size)
+            except OSError:
+                pass
+        
+        # Let the kernel copy the data, which avoids the round trip through
+        # user space and can clone or copy server-side on some filesystems
+        if hasattr(os, "copy_file_range"):
+            try:
+                remaining = size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                return
+            except OSError:
+                # Start over with the buffered copy
+                fsrc.seek(0)
+                fdst.seek(0)
+        
+        buffer = memoryview(bytearray(_COPY_BUFFER_SIZE))
+        while (n := fsrc.readinto(buffer)):
+            fdst.write(buffer[:n])
+        
+        fdst.truncate()
+
+
+def _sha256_file(path):
+    """Compute the SHA-256 of a file, reading it in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    buffer = memoryview(bytearray(_COPY_BUFFER_SIZE))
+    
+    with open(path, "rb", buffering=0) as f:
+        while (n := f.readinto(buffer)):
+            digest.update(buffer[:n])
+    
+    return digest.hexdigest()
+
+
+def _get_remote_file_info(repo_id, filename):
+    """Get the size and SHA-256 of a file on the Hugging Face Hub, or (None, None) if they can't be fetched."""
+    logger = logging.getLogger(__name__)
+    
+    try:
+        from huggingface_hub import HfApi
+        
+        paths_info = HfApi().get_paths_info(repo_id, [filename])
+        if not paths_info:
+            return None, None
+        
+        lfs = paths_info[0].lfs
+        return paths_info[0].size, lfs.sha256 if lfs else None
+    
+    except Exception as e:
+        logger.warning("Could not fetch the file info of %s from %s: %s", filename, repo_id, e)
+        return None, None
+
+
+def download_model(model_name, save_path, force=False):
+    """Download the specified model."""
+    logger = logging.getLogger(__name__)
+    
+    # Ensure the models directory exists; the parent of a bare filename is
+    # the current directory
+    save_path = Path(save_path)
+    save_path.parent.mkdir(parents=True, exist_ok=True)
     
     try:
         # Import huggingface_hub for downloading
-        from huggingface_hub import hf_hub_download
+        from huggingface_hub import snapshot_download
         
         # Map model names to Hugging Face repos and filenames
         model_map = {
@@ -90,27 +214,63 @@ def download_model(model_name, save_path, force=False):
             repo_id = model_map[model_name]["repo"]
             filename = model_map[model_name]["filename"]
         else:
-            logger.error(f"Unknown model: {model_name}")
+            logger.error("Unknown model: %s", model_name)
             return False
         
-        # Download the model
-        hf_hub_download(
-            repo_id=repo_id,
-            filename=filename,
-            local_dir=os.path.dirname(save_path),
-            local_dir_use_symlinks=False
-        )
+        expected_size, expected_sha256 = _get_remote_file_info(repo_id, filename)
+        
+        # Check if model already exists; a file left by an interrupted
+        # download is smaller than the one on the Hub
+        if save_path.exists() and not force:
+            local_size = save_path.stat().st_size
+            
+            if expected_size is None or local_size == expected_size:
+                logger.info("Model %s already exists at %s, skipping download", model_name, save_path)
+                return True
+            
+            logger.info("Model %s at %s is incomplete (%s of %s bytes), downloading again", model_name, save_path, local_size, expected_size)
         
-        # Rename if needed
-        downloaded_path = os.path.join(os.path.dirname(save_path), filename)
-        if downloaded_path != save_path:
-            os.rename(downloaded_path, save_path)
+        logger.info("Downloading %s to %s...", model_name, save_path)
+        
+        # Download and verify the model, downloading it again once if the
+        # checksum doesn't match
+        for attempt in range(2):
+            # Download the model file into the Hugging Face cache
+            snapshot_dir = _with_backoff(
+                snapshot_download,
+                repo_id=repo_id,
+                allow_patterns=filename,
+                max_workers=8,
+                force_download=attempt > 0
+            )
+            
+            # Hard-link the cached file into place instead of copying it, and
+            # copy only when the cache is on another filesystem
+            cached_path = (Path(snapshot_dir) / filename).resolve()
+            tmp_path = save_path.with_name(f"{save_path.name}.tmp")
+            tmp_path.unlink(missing_ok=True)
+            
+            try:
+                os.link(cached_path, tmp_path)
+            except OSError:
+                _fast_copy(cached_path, tmp_path)
+            
+            tmp_path.replace(save_path)
+            
+            if expected_sha256 is None or _sha256_file(save_path) == expected_sha256:
+                break
+            
+            logger.warning("Checksum mismatch for %s at %s", model_name, save_path)
+            save_path.unlink()
+        else:
+            logger.error("Downloaded %s is corrupt, giving up", model_name)
+            return False
         
-        logger.info(f"Successfully downloaded {model_name} to {save_path}")
+        logger.info("Successfully downloaded %s to %s", model_name, save_path)
         return True
     
     except Exception as e:
-        logger.error(f"Error downloading {model_name}: {str(e)}")
+        logger.error("Error downloading %s: %s", model_name, e)
         return False
 
 
@@ -119,22 +279,30 @@ def download_embedding_model(model_name, force=False):
     logger = logging.getLogger(__name__)
     
     try:
-        from sentence_transformers import SentenceTransformer
+        logger.info("Downloading embedding model %s...", model_name)
         
-        logger.info(f"Downloading embedding model {model_name}...")
+        from huggingface_hub import snapshot_download
         
-        # This will download the model if it's not already downloaded
-        _ = SentenceTransformer(model_name)
+        # Fetch the model files into the Hugging Face cache, where
+        # SentenceTransformer finds them on first use; loading the model here
+        # would import torch just to discard it
+        repo_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        _with_backoff(
+            snapshot_download,
+            repo_id=repo_id,
+            max_workers=4,
+            force_download=force
+        )
         
-        logger.info(f"Successfully downloaded embedding model {model_name}")
+        logger.info("Successfully downloaded embedding model %s", model_name)
         return True
     
     except Exception as e:
-        logger.error(f"Error downloading embedding model {model_name}: {str(e)}")
+        logger.error("Error downloading embedding model %s: %s", model_name, e)
         return False
 
 
-def main():
+async def main_async():
     """Main entry point for the script."""
     args = parse_args()
     
@@ -144,17 +312,29 @@ def main():
     
     logger.info("Starting model download process...")
     
-    # Download the LLM model
-    model_success = download_model(
-        args.model, 
-        args.path, 
-        args.force
-    )
+    _configure_hf_hub()
     
-    # Download the embedding model
-    embedding_success = download_embedding_model(
-        args.embedding_model, 
-        args.force
+    # Limit concurrent downloads to stay under the Hub's rate limits
+    semaphore = asyncio.Semaphore(int(os.getenv("HF_MAX_CONCURRENT", "4")))
+    
+    async def bounded(func, *func_args):
+        async with semaphore:
+            return await asyncio.to_thread(func, *func_args)
+    
+    # Download the LLM model and the embedding model concurrently; both are
+    # network-bound, so they run in worker threads
+    model_success, embedding_success = await asyncio.gather(
+        bounded(
+            download_model,
+            args.model, 
+            args.path, 
+            args.force
+        ),
+        bounded(
+            download_embedding_model,
+            args.embedding_model, 
+            args.force
+        )
     )
     
     if model_success and embedding_success:
@@ -166,4 +346,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(asyncio.run(main_async()))
\ No newline at end of file
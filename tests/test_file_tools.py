@@ -0,0 +1,53 @@
+"""
+File Tools Tests
+--------------
+Tests for the file tools.
+"""
+
+import sys
+import shutil
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Load the module directly so the test doesn't import the whole core package
+_spec = importlib.util.spec_from_file_location("file_tools", ROOT / "core" / "tools" / "file_tools.py")
+file_tools = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(file_tools)
+
+
+def test_fast_copy_same_file_raises(tmp_path):
+    """Copying a file onto itself raises instead of truncating it."""
+    source = tmp_path / "x.txt"
+    source.write_text("data")
+    
+    with pytest.raises(shutil.SameFileError):
+        file_tools._fast_copy(str(source), str(source))
+    
+    assert source.read_text() == "data"
+
+
+def test_copy_file_into_own_directory_keeps_source(tmp_path):
+    """Copying a file into its own directory fails and leaves the source intact."""
+    source = tmp_path / "x.txt"
+    source.write_text("data")
+    
+    result = asyncio.run(file_tools.FileTools().copy_file(str(source), str(tmp_path)))
+    
+    assert result["success"] is False
+    assert source.read_text() == "data"
+
+
+def test_fast_copy_copies_data(tmp_path):
+    """A regular copy writes the same bytes to the destination."""
+    source = tmp_path / "x.txt"
+    source.write_text("data")
+    
+    file_tools._fast_copy(str(source), str(tmp_path / "y.txt"))
+    
+    assert (tmp_path / "y.txt").read_text() == "data"
@@ -6,6 +6,9 @@ This module provides a centralized logging configuration for the Local Scout AI
 
 import os
 import sys
+import time
+import queue
+import atexit
 import logging
 import logging.handlers
 from pathlib import Path
@@ -14,6 +17,60 @@ from datetime import datetime
 # Default log directory
 LOG_DIR = Path("data/logs")
 
+# Log records don't need thread and process details, which are costly to
+# collect for every record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Background listener that writes queued records to the real handlers
+_queue_listener = None
+
+
+class CachedFormatter(logging.Formatter):
+    """A formatter that formats the timestamp once per second rather than once per record."""
+    
+    # (second, formatted time), replaced as a whole so threads sharing the
+    # formatter never see a mismatched pair
+    _cached_time = (None, "")
+    
+    def formatTime(self, record, datefmt=None):
+        """
+        Format the creation time of a record.
+        
+        Args:
+            record: The log record
+            datefmt: An optional strftime format, which bypasses the cache
+            
+        Returns:
+            The formatted time
+        """
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        
+        second = int(record.created)
+        cached_second, formatted = self._cached_time
+        if second != cached_second:
+            formatted = time.strftime("%Y-%m-%d %H:%M:%S", self.converter(second))
+            self._cached_time = (second, formatted)
+        
+        return f"{formatted},{int(record.msecs):03d}"
+
+
+# Shared by all task log files
+_TASK_FORMATTER = CachedFormatter(
+    "{asctime} - {levelname} - {message}", style="{"
+)
+
+# Whether the task log directory has been created
+_TASKS_DIR_READY = False
+
+# Task loggers by task ID, see TaskLogger.get
+_TASK_LOGGERS = {}
+
+# Bytes read per step when tailing a task log
+_TAIL_BLOCK_SIZE = 8192
+
 
 def setup_logging(level=logging.INFO, log_file=None):
     """
@@ -23,6 +80,8 @@ def setup_logging(level=logging.INFO, log_file=None):
         level: The logging level (default: INFO)
         log_file: Path to the log file (default: None, will be auto-generated)
     """
+    global _queue_listener
+    
     # Create logs directory if it doesn't exist
     LOG_DIR.mkdir(parents=True, exist_ok=True)
     
@@ -39,19 +98,20 @@ def setup_logging(level=logging.INFO, log_file=None):
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
     
-    # Clear existing handlers to avoid duplicate logs
+    # Stop the listener of a previous setup and clear existing handlers to
+    # avoid duplicate logs
+    _stop_queue_listener()
     root_logger.handlers = []
     
     # Create formatter
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    formatter = CachedFormatter(
+        "{asctime} - {name} - {levelname} - {message}", style="{"
     )
     
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
     
     # Create file handler
     file_handler = logging.handlers.RotatingFileHandler(
@@ -59,15 +119,35 @@ def setup_logging(level=logging.INFO, log_file=None):
     )
     file_handler.setLevel(level)
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
+    
+    # Log through a queue so callers only enqueue records; a background
+    # thread does the console and file writes
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
     
     # Log the start of the logging system
-    root_logger.info(f"Logging initialized (level: {logging.getLevelName(level)})")
-    root_logger.info(f"Log file: {log_file}")
+    root_logger.info("Logging initialized (level: %s)", logging.getLevelName(level))
+    root_logger.info("Log file: %s", log_file)
     
     return root_logger
 
 
+def _stop_queue_listener():
+    """Flush queued records and stop the background listener."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
 def get_logger(name):
     """
     Get a logger with the specified name.
@@ -91,38 +171,64 @@ class TaskLogger:
         Args:
             task_id: The unique ID of the task
         """
+        global _TASKS_DIR_READY
+        
         self.task_id = task_id
         self.logger = logging.getLogger(f"task.{task_id}")
         
+        # The logger is shared by every TaskLogger for this task, so only
+        # the first one attaches a file handler
+        if self.logger.handlers:
+            return
+        
         # Create a task-specific log file
         log_file = LOG_DIR / "tasks" / f"{task_id}.log"
-        log_file.parent.mkdir(parents=True, exist_ok=True)
+        if not _TASKS_DIR_READY:
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            _TASKS_DIR_READY = True
         
-        # Create a file handler for this task
-        formatter = logging.Formatter(
-            "%(asctime)s - %(levelname)s - %(message)s"
-        )
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
+        # Create a file handler for this task; the file is opened on the
+        # first write, so loggers that are only read hold no descriptor
+        file_handler = logging.FileHandler(log_file, delay=True)
+        file_handler.setFormatter(_TASK_FORMATTER)
         
-        # Add the handler to this logger
+        # Add the handler to this logger, and keep task records out of the
+        # application log
         self.logger.addHandler(file_handler)
+        self.logger.propagate = False
+    
+    @classmethod
+    def get(cls, task_id):
+        """
+        Get the task logger for a task, creating it on first use.
+        
+        Args:
+            task_id: The unique ID of the task
+            
+        Returns:
+            The TaskLogger instance
+        """
+        task_logger = _TASK_LOGGERS.get(task_id)
+        if task_logger is None:
+            task_logger = _TASK_LOGGERS[task_id] = cls(task_id)
+        
+        return task_logger
     
-    def info(self, message):
-        """Log an info message."""
-        self.logger.info(message)
+    def info(self, message, *args):
+        """Log an info message, %-formatted with args if it is emitted."""
+        self.logger.info(message, *args)
     
-    def error(self, message):
-        """Log an error message."""
-        self.logger.error(message)
+    def error(self, message, *args):
+        """Log an error message, %-formatted with args if it is emitted."""
+        self.logger.error(message, *args)
     
-    def warning(self, message):
-        """Log a warning message."""
-        self.logger.warning(message)
+    def warning(self, message, *args):
+        """Log a warning message, %-formatted with args if it is emitted."""
+        self.logger.warning(message, *args)
     
-    def debug(self, message):
-        """Log a debug message."""
-        self.logger.debug(message)
+    def debug(self, message, *args):
+        """Log a debug message, %-formatted with args if it is emitted."""
+        self.logger.debug(message, *args)
     
     def get_logs(self, max_lines=100):
         """
@@ -138,7 +244,22 @@ class TaskLogger:
         if not log_file.exists():
             return []
         
-        with open(log_file, "r") as f:
-            # Get the last N lines
-            lines = f.readlines()
-            return lines[-max_lines:] if max_lines > 0 else lines
\ No newline at end of file
+        if max_lines <= 0:
+            with open(log_file, "r") as f:
+                return f.readlines()
+        
+        with open(log_file, "rb") as f:
+            # Read blocks backwards from the end until they hold the last N
+            # lines, so long logs aren't read in full
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = bytearray()
+            
+            while position > 0 and data.count(b"\n") <= max_lines:
+                block_size = min(_TAIL_BLOCK_SIZE, position)
+                position -= block_size
+                f.seek(position)
+                data[:0] = f.read(block_size)
+        
+        lines = data.decode("utf-8", errors="replace").splitlines(keepends=True)
+        return lines[-max_lines:]
\ No newline at end of file